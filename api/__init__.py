@@ -1,5 +1,7 @@
 """API client package."""
 from api.client import APIClient
+from api.response import APIResponse
+from api.quotes_api import QuotesAPI
 from api.user_api import UserAPI
 
-__all__ = ["APIClient", "UserAPI"]
+__all__ = ["APIClient", "APIResponse", "QuotesAPI", "UserAPI"]
@@ -0,0 +1,113 @@
+"""Circuit breaker shared by all clients of one API target."""
+import threading
+import time
+
+from requests.exceptions import RequestException
+
+from api.error_codes import ErrorCode
+from config import BREAKER_RESET_TIMEOUT, BREAKER_THRESHOLD, Target
+
+AUTH_STATUSES = (401, 403)
+DOWN_STATUSES = (502, 503, 504)
+THROTTLED_STATUS = 429
+
+
+class CircuitOpenError(RequestException):
+    """Request short-circuited because the target looks broken."""
+
+
+class CircuitBreaker:
+    """Opens after consecutive transport or auth failures.
+
+    While open, requests fail immediately with CircuitOpenError. After
+    reset_timeout one request is let through (half-open): success closes
+    the circuit, failure opens it again, and a probe that ends without
+    an outcome must be released so the next request can probe.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half-open"
+
+    def __init__(self, name: str, threshold: int = BREAKER_THRESHOLD,
+                 reset_timeout: float = BREAKER_RESET_TIMEOUT,
+                 env_vars: str = "FAVQS_BASE_URL / FAVQS_API_KEY"):
+        self.name = name
+        self.env_vars = env_vars  # named in the error, where the target is configured
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.reason = ""
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def before_request(self) -> bool:
+        """Raise CircuitOpenError while open; True if this request is the half-open probe."""
+        if self.threshold <= 0:
+            return False
+        with self._lock:
+            if self.state == self.CLOSED:
+                return False
+            wait = self._opened_at + self.reset_timeout - time.monotonic()
+            if self.state == self.OPEN and wait <= 0:
+                self.state = self.HALF_OPEN
+            if self.state == self.HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+            raise CircuitOpenError(
+                f"{self.name}: circuit open after {self.failures} consecutive failures, "
+                f"last: {self.reason}. Check {self.env_vars}; "
+                f"retry in {max(wait, 0):.0f}s"
+            )
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self._probing = False
+
+    def record_failure(self, reason: str):
+        with self._lock:
+            self.failures += 1
+            self.reason = reason
+            self._probing = False
+            if self.state == self.HALF_OPEN or self.failures >= self.threshold > 0:
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+
+    def release(self):
+        """Free the probe slot of a request that ended without an outcome."""
+        with self._lock:
+            self._probing = False
+
+    def record_response(self, resp):
+        """Count auth rejections and gateway errors as failures; throttling is neither."""
+        if resp.status_code == THROTTLED_STATUS:
+            self.release()
+            return
+        if resp.status_code in AUTH_STATUSES or resp.status_code in DOWN_STATUSES:
+            self.record_failure(f"HTTP {resp.status_code} {resp.reason}")
+            return
+        error = resp.as_error()
+        if error is not None and error.error_code == ErrorCode.INVALID_TOKEN:
+            self.record_failure(f"error_code {error.error_code}: {error.message_str}")
+            return
+        self.record_success()
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(target: Target) -> CircuitBreaker:
+    """Breaker of a target, shared by every client using it.
+
+    Keyed by the whole target: targets on one URL with different API keys
+    fail independently.
+    """
+    with _breakers_lock:
+        breaker = _breakers.get(target)
+        if breaker is None:
+            breaker = _breakers[target] = CircuitBreaker(
+                target.name, env_vars=f"{target.base_url_env} / {target.api_key_env}")
+        return breaker
@@ -1,39 +1,72 @@
 """Base API client."""
 import allure
 import requests
-from config import BASE_URL, get_base_headers, get_auth_headers
+from api import netem
+from api.circuit_breaker import get_breaker
+from api.response import APIResponse
+from config import get_auth_headers, get_base_headers, get_default_target
 from utils.logger import get_logger, log_request, log_response
+from utils.profiler import span
 
 
 class APIClient:
     """Base HTTP client."""
 
-    def __init__(self):
-        self.base_url = BASE_URL
+    def __init__(self, network_profile=None, target=None):
+        self.target = target or get_default_target()
+        self.base_url = self.target.base_url
+        self.breaker = get_breaker(self.target)
         self.session = requests.Session()
         self.user_token = None
         self.logger = get_logger(self.__class__.__name__)
 
+        if network_profile is None:
+            profile = netem.get_default_profile()
+        else:
+            profile = netem.get_profile(network_profile)
+        if profile:
+            adapter = netem.EmulatedAdapter(profile)
+            self.session.mount("http://", adapter)
+            self.session.mount("https://", adapter)
+
     def _get_headers(self, authenticated=False):
         if authenticated and self.user_token:
-            return get_auth_headers(self.user_token)
-        return get_base_headers()
+            return get_auth_headers(self.user_token, self.target)
+        return get_base_headers(self.target)
 
     def _request(self, method, endpoint, data=None, authenticated=False, **kwargs):
+        probe = self.breaker.before_request()
+        try:
+            return self._send(method, endpoint, data, authenticated, **kwargs)
+        finally:
+            if probe:
+                self.breaker.release()
+
+    def _send(self, method, endpoint, data=None, authenticated=False, **kwargs):
         url = f"{self.base_url}{endpoint}"
         headers = self._get_headers(authenticated)
 
-        log_request(self.logger, method, url, headers, data)
+        with span("logging"):
+            log_request(self.logger, method, url, headers, data)
 
-        with allure.step(f"{method} {endpoint}"):
-            resp = self.session.request(
-                method=method,
-                url=url,
-                headers=headers,
-                json=data,
-                **kwargs
-            )
-            log_response(self.logger, resp)
+        with span("allure"), allure.step(f"{method} {endpoint}"):
+            try:
+                with span("network"):
+                    resp = APIResponse(self.session.request(
+                        method=method,
+                        url=url,
+                        headers=headers,
+                        json=data,
+                        **kwargs
+                    ))
+            except requests.RequestException as e:
+                # faults injected by a network profile say nothing about the target
+                if not isinstance(e, netem.EmulatedFault):
+                    self.breaker.record_failure(f"{type(e).__name__}: {e}")
+                raise
+            self.breaker.record_response(resp)
+            with span("logging"):
+                log_response(self.logger, resp)
 
             allure.attach(
                 f"URL: {url}\nMethod: {method}\nStatus: {resp.status_code}",
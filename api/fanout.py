@@ -0,0 +1,106 @@
+"""Fan-out client running each call against several targets at once."""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+from api.response import APIResponse
+from utils.stats import LatencyStats
+
+
+def shape(result) -> tuple:
+    """What has to match between targets: status, error code, top-level keys."""
+    if isinstance(result, BaseException):
+        return ("exception", type(result).__name__)
+    if isinstance(result, APIResponse):
+        body = result.json_or_none()
+        if isinstance(body, dict):
+            return (result.status_code, body.get("error_code"), tuple(sorted(body)))
+        return (result.status_code, None, type(body).__name__)
+    return (type(result).__name__,)
+
+
+@dataclass
+class FanOutDiff:
+    """Call whose result shape differs between targets."""
+    test: str
+    call: str
+    shapes: dict  # target name -> shape
+
+
+class FanOutReport:
+    """Functional differences and per-endpoint latency of all targets."""
+
+    def __init__(self, targets):
+        self.targets = [t.name for t in targets]
+        self.latency = LatencyStats()
+        self.diffs = []
+        self.current_test = ""
+        self._lock = threading.Lock()
+
+    def add_diff(self, call: str, shapes: dict):
+        with self._lock:
+            self.diffs.append(FanOutDiff(self.current_test, call, shapes))
+
+    def render(self) -> str:
+        lines = [f"{len(self.diffs)} functional differences"]
+        for d in self.diffs:
+            lines.append(f"  {d.test} :: {d.call}")
+            lines.extend(f"      {name:<12} {s}" for name, s in d.shapes.items())
+
+        lines.append("")
+        header = f"{'endpoint':<20}" + "".join(f"{t + ' p50/p95 ms':>26}" for t in self.targets)
+        lines.append(header)
+        endpoints = sorted({endpoint for endpoint, _ in self.latency.keys()})
+        for endpoint in endpoints:
+            row = f"{endpoint:<20}"
+            for t in self.targets:
+                s = self.latency.summary((endpoint, t))
+                row += f"{s['p50'] * 1000:>16.1f} /{s['p95'] * 1000:>7.1f}"
+            lines.append(row)
+        return "\n".join(lines)
+
+
+class FanOutClient:
+    """Proxy over one client per target.
+
+    Method calls run on all targets concurrently; the first (primary)
+    target's result is returned, so tests assert against it as usual.
+    Other attributes are read from the primary client.
+    """
+
+    def __init__(self, factory, targets, report: FanOutReport, executor: ThreadPoolExecutor):
+        self.clients = [factory(target=t) for t in targets]
+        self.primary = self.clients[0]
+        self.report = report
+        self.executor = executor
+
+    def _timed(self, client, name, args, kwargs):
+        start = time.perf_counter()
+        try:
+            result = getattr(client, name)(*args, **kwargs)
+        except Exception as e:
+            result = e
+        self.report.latency.add((name, client.target.name), time.perf_counter() - start,
+                                isinstance(result, BaseException))
+        return result
+
+    def __getattr__(self, name):
+        attr = getattr(self.primary, name)
+        if not callable(attr):
+            return attr
+
+        def call(*args, **kwargs):
+            futures = [self.executor.submit(self._timed, c, name, args, kwargs) for c in self.clients[1:]]
+            # primary runs in the test thread, so its allure steps land in the test
+            results = [self._timed(self.primary, name, args, kwargs)] + [f.result() for f in futures]
+
+            shapes = {c.target.name: shape(r) for c, r in zip(self.clients, results)}
+            if len(set(shapes.values())) > 1:
+                self.report.add_diff(name, shapes)
+
+            if isinstance(results[0], BaseException):
+                raise results[0]
+            return results[0]
+
+        return call
@@ -0,0 +1,36 @@
+"""Health probe of an API target."""
+from typing import Optional
+
+import requests
+
+from api import netem
+from api.circuit_breaker import AUTH_STATUSES
+from api.client import APIClient
+from api.error_codes import ErrorCode
+
+# /qotd is served without checking the app token, /quotes is not
+PROBE_ENDPOINT = "/quotes"
+PROBE_TIMEOUT = 10
+
+
+def check_health(client: APIClient) -> Optional[str]:
+    """Problem with the client's target, or None if it is usable.
+
+    Faults injected by network emulation say nothing about the target and
+    are not reported; probe with network_profile="none".
+    """
+    target = client.target
+    where = f"{target.name} ({client.base_url})"
+    try:
+        resp = client.get(PROBE_ENDPOINT, params={"page": 1}, timeout=PROBE_TIMEOUT)
+    except netem.EmulatedFault:
+        return None
+    except requests.RequestException as e:
+        return f"{where} is unreachable: {type(e).__name__}: {e}. Check {target.base_url_env} and the network."
+
+    error = resp.as_error()
+    if resp.status_code in AUTH_STATUSES or (error and error.error_code == ErrorCode.INVALID_TOKEN):
+        return f"{where} rejected the API key (HTTP {resp.status_code}). Check {target.api_key_env}."
+    if resp.status_code >= 500:
+        return f"{where} is failing: HTTP {resp.status_code} {resp.reason}."
+    return None
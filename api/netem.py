@@ -0,0 +1,156 @@
+"""In-process network condition emulation for the HTTP session."""
+import json
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional, Union
+
+from requests import Response, exceptions
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from config import NET_PROFILE
+
+
+@dataclass(frozen=True)
+class NetworkProfile:
+    """Network conditions applied to every request of a session."""
+    name: str
+    latency: float = 0.0                  # mean added latency, seconds
+    jitter: float = 0.0                   # spread of the latency, seconds
+    distribution: str = "normal"          # normal | lognormal | exponential | uniform
+    bandwidth: Optional[int] = None       # shared link cap, bytes per second
+    reset_rate: float = 0.0               # share of requests failing with a connection reset
+    throttle_rate: float = 0.0            # share of requests answered with 429
+    retry_after: int = 1
+    seed: Optional[int] = 0               # fixed seed keeps runs reproducible
+
+    def sample_latency(self, rng: random.Random) -> float:
+        if not self.latency and not self.jitter:
+            return 0.0
+        if self.distribution == "lognormal" and self.latency > 0:
+            sigma = self.jitter / self.latency if self.jitter else 0.0
+            value = rng.lognormvariate(0.0, sigma) * self.latency
+        elif self.distribution == "exponential" and self.latency > 0:
+            value = rng.expovariate(1.0 / self.latency)
+        elif self.distribution == "uniform":
+            value = rng.uniform(self.latency - self.jitter, self.latency + self.jitter)
+        else:
+            value = rng.gauss(self.latency, self.jitter)
+        return max(value, 0.0)
+
+
+PROFILES = {
+    "lan": NetworkProfile("lan", latency=0.001),
+    "broadband": NetworkProfile("broadband", latency=0.03, jitter=0.01, bandwidth=5_000_000),
+    "3g": NetworkProfile("3g", latency=0.3, jitter=0.1, distribution="lognormal", bandwidth=200_000),
+    "lossy": NetworkProfile("lossy", latency=0.1, jitter=0.05, reset_rate=0.05),
+    "throttled": NetworkProfile("throttled", latency=0.05, throttle_rate=0.2, retry_after=2),
+    "flaky": NetworkProfile("flaky", latency=0.2, jitter=0.2, distribution="exponential",
+                            bandwidth=500_000, reset_rate=0.03, throttle_rate=0.05),
+}
+
+
+def get_profile(profile: Union[str, NetworkProfile, None]) -> Optional[NetworkProfile]:
+    """Resolve a profile name; None and 'none' disable emulation."""
+    if profile is None or isinstance(profile, NetworkProfile):
+        return profile
+    if profile == "none":
+        return None
+    if profile not in PROFILES:
+        raise ValueError(f"Unknown network profile '{profile}', expected one of {sorted(PROFILES)}")
+    return PROFILES[profile]
+
+
+_default = NET_PROFILE or None
+
+
+def set_default_profile(profile: Union[str, NetworkProfile, None]):
+    """Profile used by clients created without an explicit one."""
+    global _default
+    get_profile(profile)
+    _default = profile
+
+
+def get_default_profile() -> Optional[NetworkProfile]:
+    return get_profile(_default)
+
+
+class EmulatedFault(Exception):
+    """Transport error injected by EmulatedAdapter, not caused by the target."""
+
+
+class EmulatedReset(EmulatedFault, exceptions.ConnectionError):
+    """Emulated connection reset."""
+
+
+class EmulatedTimeout(EmulatedFault, exceptions.ReadTimeout):
+    """Emulated latency above the read timeout."""
+
+
+class EmulatedAdapter(HTTPAdapter):
+    """HTTPAdapter that delays, caps, resets or throttles requests."""
+
+    def __init__(self, profile: NetworkProfile, **kwargs):
+        super().__init__(**kwargs)
+        self.profile = profile
+        self._rng = random.Random(profile.seed)
+        self._lock = threading.Lock()
+        self._link_free_at = 0.0
+
+    def _draw(self):
+        with self._lock:
+            p = self.profile
+            return (p.sample_latency(self._rng),
+                    self._rng.random() < p.reset_rate,
+                    self._rng.random() < p.throttle_rate)
+
+    def _transfer(self, size: int):
+        """Wait for size bytes to pass through the shared capped link."""
+        if not self.profile.bandwidth or not size:
+            return
+        with self._lock:
+            start = max(time.monotonic(), self._link_free_at)
+            self._link_free_at = start + size / self.profile.bandwidth
+            done = self._link_free_at
+        time.sleep(max(done - time.monotonic(), 0.0))
+
+    def _throttled(self, request) -> Response:
+        resp = Response()
+        resp.status_code = 429
+        resp.reason = "Too Many Requests"
+        resp.headers = CaseInsensitiveDict({
+            "Content-Type": "application/json",
+            "Retry-After": str(self.profile.retry_after),
+        })
+        resp._content = json.dumps({"message": "Throttled by network profile"}).encode()
+        resp.encoding = "utf-8"
+        resp.url = request.url
+        resp.request = request
+        resp.connection = self
+        return resp
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        delay, reset, throttle = self._draw()
+        read_timeout = timeout[1] if isinstance(timeout, tuple) else timeout
+
+        if read_timeout is not None and delay > read_timeout:
+            time.sleep(read_timeout)
+            raise EmulatedTimeout(
+                f"Emulated latency {delay:.3f}s exceeds timeout", request=request)
+        time.sleep(delay)
+
+        if reset:
+            raise EmulatedReset(
+                ConnectionResetError(104, "Connection reset by peer (emulated)"), request=request)
+        if throttle:
+            return self._throttled(request)
+
+        body = request.body or b""
+        self._transfer(len(body))
+        resp = super().send(request, stream=stream, timeout=timeout, verify=verify,
+                            cert=cert, proxies=proxies)
+        if not stream:
+            self._transfer(len(resp.content))
+        return resp
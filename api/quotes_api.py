@@ -0,0 +1,35 @@
+"""Quotes API client."""
+from typing import Iterator, Optional
+
+from api.client import APIClient
+from models.quote import Quote
+
+
+class QuotesAPI(APIClient):
+    """Quote listing and filtering."""
+
+    def list_quotes(self, page: int = 1, query: Optional[str] = None, filter_type: Optional[str] = None):
+        """Get one page of quotes; filter_type is tag, author or user."""
+        params = {"page": page}
+        if query:
+            params["filter"] = query
+        if filter_type:
+            params["type"] = filter_type
+        return self.get("/quotes", params=params, authenticated=self.user_token is not None)
+
+    def get_page(self, page: int = 1, query: Optional[str] = None, filter_type: Optional[str] = None):
+        """Page as (quotes, is_last_page)."""
+        data = self.list_quotes(page, query, filter_type).json()
+        quotes = [Quote.from_dict(q) for q in data.get("quotes") or [] if "id" in q]
+        return quotes, bool(data.get("last_page", True) or not quotes)
+
+    def iter_pages(self, query: Optional[str] = None, filter_type: Optional[str] = None,
+                   max_pages: Optional[int] = None) -> Iterator[list]:
+        """Stream pages of Quote models until the last page."""
+        page = 1
+        while max_pages is None or page <= max_pages:
+            quotes, last = self.get_page(page, query, filter_type)
+            yield quotes
+            if last:
+                return
+            page += 1
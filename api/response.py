@@ -0,0 +1,77 @@
+"""Parse-once response wrapper."""
+from requests import Response
+
+from utils.profiler import span
+
+_UNSET = object()
+
+
+class APIResponse:
+    """Wraps requests.Response and decodes the body at most once."""
+
+    def __init__(self, response: Response):
+        self.raw = response
+        self._json = _UNSET
+        self._json_error = None
+        self._user = None
+        self._error = _UNSET
+
+    def __getattr__(self, name):
+        return getattr(self.raw, name)
+
+    def __repr__(self):
+        return f"<APIResponse [{self.raw.status_code}]>"
+
+    # dunder methods bypass __getattr__, so delegate them explicitly
+
+    def __bool__(self):
+        return self.raw.ok
+
+    def __iter__(self):
+        return iter(self.raw)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.raw.close()
+
+    def json(self, **kwargs):
+        """Decoded body, memoized. Raises ValueError on a non-JSON body.
+
+        kwargs go to Response.json on the first decode only.
+        """
+        if self._json is _UNSET:
+            if self._json_error is not None:
+                raise self._json_error
+            try:
+                with span("json"):
+                    self._json = self.raw.json(**kwargs)
+            except ValueError as e:
+                self._json_error = e
+                raise
+        return self._json
+
+    def json_or_none(self):
+        try:
+            return self.json()
+        except ValueError:
+            return None
+
+    def as_user(self):
+        """Body as UserResponse."""
+        # models import api.error_codes, so import lazily to avoid a cycle
+        from models.user import UserResponse
+
+        if self._user is None:
+            self._user = UserResponse.from_dict(self.json())
+        return self._user
+
+    def as_error(self):
+        """Body as ErrorResponse, or None if it isn't an error."""
+        from models.response import ErrorResponse
+
+        if self._error is _UNSET:
+            data = self.json_or_none()
+            self._error = ErrorResponse.from_dict(data) if isinstance(data, dict) else None
+        return self._error
@@ -24,8 +24,7 @@ class UserAPI(APIClient):
 
     def get_user_model(self, login: str, authenticated=False) -> UserResponse:
         """Get user as model."""
-        resp = self.get_user(login, authenticated)
-        return UserResponse.from_dict(resp.json())
+        return self.get_user(login, authenticated).as_user()
 
     def update_user(self, current_login: str, **kwargs):
         """Update user fields."""
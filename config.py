@@ -1,5 +1,6 @@
 """Config."""
 import os
+from dataclasses import dataclass
 from pathlib import Path
 
 try:
@@ -11,15 +12,85 @@ except ImportError:
 BASE_URL = os.getenv("FAVQS_BASE_URL", "https://favqs.com/api")
 API_KEY = os.getenv("FAVQS_API_KEY", "YOUR_API_KEY_HERE")
 
+# comma separated target names for fan-out runs, e.g. "staging,prod"
+TARGETS = os.getenv("FAVQS_TARGETS", "")
 
-def get_base_headers():
+# network emulation profile for all clients, see api/netem.py
+NET_PROFILE = os.getenv("FAVQS_NET_PROFILE", "")
+
+# circuit breaker: consecutive failures to open (0 disables) and seconds before a retry
+BREAKER_THRESHOLD = int(os.getenv("FAVQS_BREAKER_THRESHOLD", "3"))
+BREAKER_RESET_TIMEOUT = float(os.getenv("FAVQS_BREAKER_RESET_TIMEOUT", "30"))
+
+# flight recorder: entries kept per test and max chars per dumped body
+RECORDER_CAPACITY = int(os.getenv("FAVQS_RECORDER_CAPACITY", "200"))
+RECORDER_MAX_BODY = int(os.getenv("FAVQS_RECORDER_MAX_BODY", "4000"))
+
+
+@dataclass(frozen=True)
+class Target:
+    """API environment a client talks to."""
+    name: str
+    base_url: str
+    api_key: str
+
+    @property
+    def base_url_env(self) -> str:
+        """Variable the base URL is read from."""
+        return env_prefix(self.name) + "BASE_URL"
+
+    @property
+    def api_key_env(self) -> str:
+        """Variable the API key is read from; named targets fall back to FAVQS_API_KEY."""
+        var = env_prefix(self.name) + "API_KEY"
+        return var if os.getenv(var) else "FAVQS_API_KEY"
+
+
+def env_prefix(name: str) -> str:
+    """FAVQS_ for the default target, FAVQS_<NAME>_ for the others."""
+    if name == "default":
+        return "FAVQS_"
+    return f"FAVQS_{name.upper().replace('-', '_')}_"
+
+
+DEFAULT_TARGET = Target("default", BASE_URL, API_KEY)
+_default_target = DEFAULT_TARGET
+
+
+def get_target(name: str) -> Target:
+    """Target from FAVQS_<NAME>_BASE_URL and FAVQS_<NAME>_API_KEY."""
+    if name == DEFAULT_TARGET.name:
+        return DEFAULT_TARGET
+    prefix = env_prefix(name)
+    base_url = os.getenv(prefix + "BASE_URL")
+    if not base_url:
+        raise ValueError(f"Target '{name}' has no {prefix}BASE_URL")
+    return Target(name, base_url, os.getenv(prefix + "API_KEY", API_KEY))
+
+
+def get_targets(names: str = TARGETS) -> list:
+    return [get_target(n.strip()) for n in names.split(",") if n.strip()]
+
+
+def set_default_target(target: Target):
+    """Target used by clients created without an explicit one."""
+    global _default_target
+    _default_target = target
+
+
+def get_default_target() -> Target:
+    return _default_target
+
+
+def get_base_headers(target: Target = None):
+    api_key = (target or _default_target).api_key
     return {
         "Content-Type": "application/json",
-        "Authorization": f'Token token="{API_KEY}"'
+        "Authorization": f'Token token="{api_key}"'
     }
 
 
-def get_auth_headers(user_token):
-    headers = get_base_headers()
+def get_auth_headers(user_token, target: Target = None):
+    headers = get_base_headers(target)
     headers["User-Token"] = user_token
     return headers
@@ -1,4 +1,5 @@
 """Data models package."""
 from models.user import UserData, UserResponse, AccountDetails
+from models.quote import Quote
 
-__all__ = ["UserData", "UserResponse", "AccountDetails"]
+__all__ = ["UserData", "UserResponse", "AccountDetails", "Quote"]
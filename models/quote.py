@@ -0,0 +1,24 @@
+"""Quote models."""
+from dataclasses import dataclass, field
+
+
+@dataclass
+class Quote:
+    """FavQs quote."""
+    id: int
+    body: str
+    author: str = ""
+    tags: list = field(default_factory=list)
+    dialogue: bool = False
+    private: bool = False
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        return cls(
+            id=data["id"],
+            body=data.get("body") or "",
+            author=data.get("author") or "",
+            tags=list(data.get("tags") or []),
+            dialogue=data.get("dialogue", False),
+            private=data.get("private", False)
+        )
@@ -1,8 +1,87 @@
 """API response models."""
 from dataclasses import dataclass
+from functools import cached_property
 from typing import Optional, Union
 
-from api.error_codes import ErrorCode
+from api.error_codes import ErrorCode, Msg
+
+# distinct pattern texts: Msg has aliases such as PWD_LONG / LOGIN_LONG
+MSG_PATTERNS = tuple(dict.fromkeys(value for name, value in vars(Msg).items() if name.isupper()))
+
+
+def flatten_message(message) -> list:
+    """Error message as [(field, text)]; field is None for plain messages."""
+    if isinstance(message, dict):
+        pairs = []
+        for field, errors in message.items():
+            errs = errors if isinstance(errors, list) else [errors]
+            pairs.extend((field, str(e)) for e in errs)
+        return pairs
+    return [(None, message if isinstance(message, str) else str(message))]
+
+
+def _join(pairs) -> str:
+    return "; ".join(text if field is None else f"{field}: {text}" for field, text in pairs)
+
+
+def message_to_str(message) -> str:
+    return _join(flatten_message(message))
+
+
+def match_patterns(lowered: str) -> frozenset:
+    """Msg patterns found in text, without those inside a longer match."""
+    found = [p for p in MSG_PATTERNS if p in lowered]
+    return frozenset(p for p in found if not any(p != other and p in other for other in found))
+
+
+@dataclass(frozen=True)
+class ErrorIndex:
+    """Error message normalized once for repeated lookups."""
+    error_code: Optional[int]
+    code: Optional[ErrorCode]
+    text: str
+    lowered: str
+    fields: dict        # lowercased field -> tuple of lowercased messages
+    structured: bool    # message was a field -> errors dict
+    patterns: frozenset  # matched Msg pattern texts
+
+    @classmethod
+    def build(cls, error_code: Optional[int], message: Union[str, dict]) -> "ErrorIndex":
+        pairs = flatten_message(message)
+        text = _join(pairs)
+        lowered = text.lower()
+
+        fields = {k.lower(): [] for k in message} if isinstance(message, dict) else {}
+        for field, t in pairs:
+            if field is not None:
+                fields.setdefault(field.lower(), []).append(t.lower())
+
+        try:
+            code = ErrorCode(error_code)
+        except ValueError:
+            code = None
+
+        return cls(
+            error_code=error_code,
+            code=code,
+            text=text,
+            lowered=lowered,
+            fields={k: tuple(v) for k, v in fields.items()},
+            structured=isinstance(message, dict),
+            patterns=match_patterns(lowered),
+        )
+
+    def has_field(self, field: str) -> bool:
+        if self.structured:
+            return field.lower() in self.fields
+        return field.lower() in self.lowered
+
+    def contains(self, text: str) -> bool:
+        return text.lower() in self.lowered
+
+    def matches(self, pattern: str) -> bool:
+        """Check a Msg pattern by name, e.g. 'EMAIL_TAKEN'."""
+        return getattr(Msg, pattern) in self.lowered
 
 
 @dataclass
@@ -17,26 +96,20 @@ class ErrorResponse:
             return None
         return cls(error_code=data["error_code"], message=data.get("message", ""))
 
+    @cached_property
+    def index(self) -> ErrorIndex:
+        return ErrorIndex.build(self.error_code, self.message)
+
     @property
     def is_validation_error(self) -> bool:
         return self.error_code == ErrorCode.VALIDATION_ERROR
 
     @property
     def message_str(self) -> str:
-        if isinstance(self.message, str):
-            return self.message
-        if isinstance(self.message, dict):
-            parts = []
-            for field, errors in self.message.items():
-                errs = errors if isinstance(errors, list) else [errors]
-                parts.extend(f"{field}: {e}" for e in errs)
-            return "; ".join(parts)
-        return str(self.message)
+        return self.index.text
 
     def has_field(self, field: str) -> bool:
-        if isinstance(self.message, dict):
-            return field.lower() in [k.lower() for k in self.message.keys()]
-        return field.lower() in self.message_str.lower()
+        return self.index.has_field(field)
 
     def contains(self, text: str) -> bool:
-        return text.lower() in self.message_str.lower()
+        return self.index.contains(text)
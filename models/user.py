@@ -3,6 +3,23 @@ from dataclasses import dataclass
 from typing import Optional
 import uuid
 
+_namespace = ""
+
+
+def set_namespace(namespace: str):
+    """Prefix generated ids, so parallel runs never collide.
+
+    Namespaces of parallel runs must be prefix-free and start with a
+    non-hex char, see utils.sharding.shard_namespace.
+    """
+    global _namespace
+    _namespace = namespace
+
+
+def unique_id(length: int = 8) -> str:
+    """Namespace followed by length random hex chars."""
+    return _namespace + uuid.uuid4().hex[:length]
+
 
 @dataclass
 class UserData:
@@ -13,7 +30,7 @@ class UserData:
 
     @classmethod
     def generate(cls, prefix: str = "testuser"):
-        uid = uuid.uuid4().hex[:8]
+        uid = unique_id()
         return cls(login=f"{prefix}_{uid}", email=f"{prefix}_{uid}@test.com")
 
     def to_dict(self) -> dict:
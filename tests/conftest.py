@@ -1,32 +1,189 @@
 """Pytest fixtures."""
 import shutil
-import uuid
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+import allure
 import pytest
 
+import config
+from api import netem
+from api.fanout import FanOutClient, FanOutReport
+from api.health import check_health
 from api.user_api import UserAPI
-from models.user import UserData
+from models.user import UserData, set_namespace, unique_id
+from utils import sharding
 from utils.assertions import AssertionHelper
+from utils.recorder import start_recording, stop_recording, get_recorder
 
 
 ALLURE_DIR = Path(__file__).parent.parent / "allure-results"
 
 
+def pytest_addoption(parser):
+    parser.addoption("--shard", default=None, help="run only shard i/N, e.g. 2/4")
+    parser.addoption("--durations-file", default=str(sharding.DURATIONS_FILE),
+                     help="recorded test durations used to balance shards")
+    parser.addoption("--net-profile", default=None, choices=["none", *netem.PROFILES],
+                     help="emulate network conditions for all clients")
+    parser.addoption("--no-health-check", action="store_true", default=False,
+                     help="skip the session-start probe of the API targets")
+    parser.addoption("--targets", default=config.TARGETS,
+                     help="comma separated targets; with several, every test fans out to all of them")
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_configure(config):
+    """Set up targets, shard namespace and result bundle before allure starts."""
+    _configure_targets(config)
+    config.shard = None
+    config.shard_durations = {}
+    value = config.getoption("--shard")
+    if not value:
+        return
+    try:
+        index, total = sharding.parse_shard(value)
+    except ValueError as e:
+        raise pytest.UsageError(str(e))
+
+    config.shard = (index, total)
+    set_namespace(sharding.shard_namespace(index))
+    bundle = sharding.bundle_dir(index, total)
+    if bundle.exists():
+        shutil.rmtree(bundle)
+    if getattr(config.option, "allure_report_dir", None) is None:
+        config.option.allure_report_dir = str(bundle / "allure-results")
+
+
+def _configure_targets(pytest_config):
+    pytest_config.fanout = None
+    try:
+        targets = config.get_targets(pytest_config.getoption("--targets"))
+    except ValueError as e:
+        raise pytest.UsageError(str(e))
+    if not targets:
+        return
+    config.set_default_target(targets[0])
+    if len(targets) > 1:
+        pytest_config.fanout = FanOutReport(targets)
+        pytest_config.fanout_targets = targets
+        pytest_config.fanout_executor = ThreadPoolExecutor(max_workers=4 * len(targets))
+
+
+def pytest_unconfigure(config):
+    if getattr(config, "fanout", None):
+        config.fanout_executor.shutdown(wait=False)
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    if getattr(config, "fanout", None):
+        terminalreporter.write_sep("=", "fan-out: " + " vs ".join(config.fanout.targets))
+        terminalreporter.write_line(config.fanout.render())
+
+
+def pytest_collection_modifyitems(config, items):
+    """Keep only the items of the current shard."""
+    if not config.shard:
+        return
+    index, total = config.shard
+    durations = sharding.load_durations(config.getoption("--durations-file"))
+    assignment = sharding.assign_shards([i.nodeid for i in items], total, durations)
+
+    selected = [i for i in items if assignment[i.nodeid] == index]
+    deselected = [i for i in items if assignment[i.nodeid] != index]
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+    items[:] = selected
+
+
 def pytest_sessionfinish(session, exitstatus):
-    """Cleanup allure results in success."""
+    """Write shard durations; cleanup allure results in success."""
+    config = session.config
+    if config.shard:
+        bundle = sharding.bundle_dir(*config.shard)
+        sharding.save_durations(bundle / "durations.json", config.shard_durations)
+        return
     if exitstatus == 0 and ALLURE_DIR.exists():
         shutil.rmtree(ALLURE_DIR)
 
 
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_protocol(item, nextitem):
+    """Record request/response traffic of a single test."""
+    start_recording()
+    yield
+    stop_recording()
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    """Collect shard durations; dump the flight recorder on failure."""
+    outcome = yield
+    report = outcome.get_result()
+    if item.config.shard:
+        durations = item.config.shard_durations
+        durations[item.nodeid] = durations.get(item.nodeid, 0.0) + report.duration
+
+    recorder = get_recorder()
+    if not report.failed or recorder is None or not recorder.entries:
+        return
+    dump = recorder.dump()
+    recorder.clear()
+    report.sections.append((f"Flight recorder ({report.when})", dump))
+    allure.attach(dump, name="Flight recorder", attachment_type=allure.attachment_type.TEXT)
+
+
+@pytest.fixture(scope="session")
+def health_gate(request):
+    """Stop the session at the first API test if a target is down or rejects the API key."""
+    cfg = request.config
+    if cfg.getoption("--no-health-check"):
+        return
+    targets = cfg.fanout_targets if cfg.fanout else [config.get_default_target()]
+    # probe without --net-profile faults: an emulated reset is not an outage
+    probes = (UserAPI(target=t, network_profile="none") for t in targets)
+    problems = [p for p in map(check_health, probes) if p]
+    if problems:
+        pytest.exit("API health check failed:\n  " + "\n  ".join(problems)
+                    + "\nUse --no-health-check to run anyway.", returncode=pytest.ExitCode.TESTS_FAILED)
+
+
+@pytest.fixture(autouse=True)
+def network_profile(request):
+    """Apply net_profile marker or --net-profile to clients of the test."""
+    marker = request.node.get_closest_marker("net_profile")
+    profile = marker.args[0] if marker else request.config.getoption("--net-profile")
+    if profile is None:
+        yield netem.get_default_profile()
+        return
+    previous = netem.get_default_profile()
+    netem.set_default_profile(profile)
+    yield netem.get_default_profile()
+    netem.set_default_profile(previous)
+
+
 @pytest.fixture
 def check():
     return AssertionHelper()
 
 
 @pytest.fixture
-def api_client():
-    return UserAPI()
+def api_factory(request, health_gate):
+    """Builds extra clients for the test; with several --targets they fan out too."""
+    cfg = request.config
+
+    def make():
+        if not cfg.fanout:
+            return UserAPI()
+        cfg.fanout.current_test = request.node.nodeid
+        return FanOutClient(UserAPI, cfg.fanout_targets, cfg.fanout, cfg.fanout_executor)
+    return make
+
+
+@pytest.fixture
+def api_client(api_factory):
+    """UserAPI, or a fan-out proxy over all --targets."""
+    return api_factory()
 
 
 @pytest.fixture
@@ -49,9 +206,9 @@ def updated_user_data():
 
 @pytest.fixture
 def unique_email():
-    return f"test_{uuid.uuid4().hex[:8]}@test.com"
+    return f"test_{unique_id()}@test.com"
 
 
 @pytest.fixture
 def unique_login():
-    return f"user_{uuid.uuid4().hex[:8]}"
+    return f"user_{unique_id()}"
@@ -0,0 +1,179 @@
+"""Circuit breaker tests."""
+import json
+import uuid
+
+import allure
+import pytest
+import requests
+from requests import Response
+from requests.adapters import HTTPAdapter
+
+from api import netem
+from api.circuit_breaker import CircuitBreaker, CircuitOpenError, get_breaker
+from api.response import APIResponse
+from api.user_api import UserAPI
+from config import Target
+
+
+def response(status: int, body=None) -> APIResponse:
+    resp = Response()
+    resp.status_code = status
+    resp.reason = "reason"
+    resp._content = json.dumps(body or {}).encode()
+    resp.encoding = "utf-8"
+    return APIResponse(resp)
+
+
+def new_target(base_url="http://127.0.0.1:9/api", api_key="key") -> Target:
+    return Target(f"t-{uuid.uuid4().hex[:6]}", base_url, api_key)
+
+
+class BrokenAdapter(HTTPAdapter):
+    def __init__(self, error):
+        super().__init__()
+        self.error = error
+
+    def send(self, request, **kwargs):
+        raise self.error
+
+
+@allure.epic("Test framework")
+@allure.feature("Circuit breaker")
+class TestStateMachine:
+    """closed -> open -> half-open -> closed/open."""
+
+    def test_opens_after_threshold(self):
+        breaker = CircuitBreaker("t", threshold=3, reset_timeout=60)
+        for _ in range(2):
+            breaker.before_request()
+            breaker.record_failure("reset")
+        assert breaker.state == CircuitBreaker.CLOSED
+
+        breaker.record_failure("reset")
+        assert breaker.state == CircuitBreaker.OPEN
+        with pytest.raises(CircuitOpenError, match="3 consecutive failures, last: reset"):
+            breaker.before_request()
+
+    def test_success_resets_count(self):
+        breaker = CircuitBreaker("t", threshold=2, reset_timeout=60)
+        breaker.record_failure("x")
+        breaker.record_success()
+        breaker.record_failure("x")
+
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    def test_half_open_single_probe(self):
+        breaker = CircuitBreaker("t", threshold=1, reset_timeout=0)
+        breaker.record_failure("x")
+
+        assert breaker.before_request() is True
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        with pytest.raises(CircuitOpenError):
+            breaker.before_request()
+
+        breaker.record_success()
+        assert breaker.state == CircuitBreaker.CLOSED
+        assert breaker.before_request() is False
+
+    def test_failed_probe_reopens(self):
+        breaker = CircuitBreaker("t", threshold=5, reset_timeout=0)
+        for _ in range(5):
+            breaker.record_failure("x")
+        breaker.before_request()
+        breaker.record_failure("still down")
+
+        assert breaker.state == CircuitBreaker.OPEN
+
+    def test_released_probe_lets_next_request_probe(self):
+        breaker = CircuitBreaker("t", threshold=1, reset_timeout=0)
+        breaker.record_failure("x")
+        breaker.before_request()
+        breaker.release()
+
+        assert breaker.before_request() is True
+
+    def test_disabled(self):
+        breaker = CircuitBreaker("t", threshold=0)
+        for _ in range(10):
+            breaker.record_failure("x")
+
+        assert breaker.before_request() is False
+
+    @pytest.mark.parametrize("status, body, failed", [
+        (401, None, True),
+        (503, None, True),
+        (200, {"error_code": 33, "message": "Invalid token"}, True),
+        (200, {"error_code": 32, "message": "Validation"}, False),
+        (200, {"login": "bob"}, False),
+        (429, None, False),
+    ])
+    def test_record_response(self, status, body, failed):
+        breaker = CircuitBreaker("t", threshold=1, reset_timeout=60)
+        breaker.record_response(response(status, body))
+
+        assert (breaker.state == CircuitBreaker.OPEN) is failed
+
+    def test_throttled_probe_keeps_half_open(self):
+        breaker = CircuitBreaker("t", threshold=1, reset_timeout=0)
+        breaker.record_failure("x")
+        breaker.before_request()
+        breaker.record_response(response(429))
+
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        assert breaker.before_request() is True
+
+
+@allure.epic("Test framework")
+@allure.feature("Circuit breaker")
+class TestClientBreaker:
+    """Breaker use in APIClient."""
+
+    def test_one_breaker_per_target(self):
+        first = new_target(api_key="a")
+        second = Target(first.name + "-2", first.base_url, "b")
+
+        assert get_breaker(first) is get_breaker(first)
+        assert get_breaker(first) is not get_breaker(second)
+
+    def test_transport_failures_open_circuit(self):
+        client = UserAPI(network_profile="none", target=new_target())
+        client.session.mount("http://", BrokenAdapter(requests.ConnectionError("refused")))
+        for _ in range(client.breaker.threshold):
+            with pytest.raises(requests.ConnectionError):
+                client.get_user("bob")
+
+        with pytest.raises(CircuitOpenError):
+            client.get_user("bob")
+
+    def test_emulated_faults_not_counted(self):
+        profile = netem.NetworkProfile("reset", reset_rate=1.0)
+        client = UserAPI(network_profile=profile, target=new_target())
+        for _ in range(client.breaker.threshold + 1):
+            with pytest.raises(requests.ConnectionError):
+                client.get_user("bob")
+
+        assert client.breaker.failures == 0
+        assert client.breaker.state == CircuitBreaker.CLOSED
+
+    def test_probe_released_on_unexpected_error(self):
+        client = UserAPI(network_profile="none", target=new_target())
+        client.breaker.reset_timeout = 0
+        client.breaker.record_failure("x")
+        client.breaker.record_failure("x")
+        client.breaker.record_failure("x")
+        client.session.mount("http://", BrokenAdapter(RuntimeError("bug")))
+
+        with pytest.raises(RuntimeError):
+            client.get_user("bob")
+        assert client.breaker.before_request() is True
+
+    def test_open_error_names_target_variables(self, monkeypatch):
+        target = new_target()
+        prefix = target.name.upper().replace("-", "_")
+        monkeypatch.setenv(f"FAVQS_{prefix}_API_KEY", "key")
+        breaker = get_breaker(target)
+        for _ in range(breaker.threshold):
+            breaker.record_failure("x")
+
+        with pytest.raises(CircuitOpenError, match=f"Check FAVQS_{prefix}_BASE_URL / FAVQS_{prefix}_API_KEY"):
+            breaker.before_request()
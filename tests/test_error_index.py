@@ -0,0 +1,116 @@
+"""Error index and error class aggregation tests."""
+import json
+
+import allure
+import pytest
+from requests import Response
+
+from api.error_codes import ErrorCode, Msg
+from api.response import APIResponse
+from models.response import ErrorIndex
+from utils.assertions import AssertionHelper, _error_index
+from utils.error_classes import ErrorAggregator
+
+
+def make_response(status: int, body, content_type="application/json") -> APIResponse:
+    resp = Response()
+    resp.status_code = status
+    resp.reason = "Bad Gateway" if status == 502 else "OK"
+    resp.headers["Content-Type"] = content_type
+    resp._content = (body if isinstance(body, str) else json.dumps(body)).encode()
+    resp.encoding = "utf-8"
+    return APIResponse(resp)
+
+
+VALIDATION = {
+    "error_code": ErrorCode.VALIDATION_ERROR,
+    "message": {"Login": ["is too long (maximum is 20 characters)"], "email": ["is not a valid email"]},
+}
+
+
+@allure.epic("Test framework")
+@allure.feature("Error index")
+class TestErrorIndex:
+    """Normalized error messages."""
+
+    def test_structured_message(self):
+        index = ErrorIndex.build(VALIDATION["error_code"], VALIDATION["message"])
+
+        assert index.code == ErrorCode.VALIDATION_ERROR
+        assert index.structured
+        assert index.fields["login"] == ("is too long (maximum is 20 characters)",)
+        assert index.has_field("LOGIN")
+        assert not index.has_field("password")
+        assert index.text == "Login: is too long (maximum is 20 characters); email: is not a valid email"
+
+    def test_plain_message(self):
+        index = ErrorIndex.build(ErrorCode.SESSION_EXISTS, "Session already exists")
+
+        assert not index.structured
+        assert index.contains("SESSION")
+        assert index.matches("SESSION")
+
+    def test_unknown_code(self):
+        assert ErrorIndex.build(99, "boom").code is None
+
+    def test_alias_patterns_deduplicated(self):
+        long_index = ErrorIndex.build(32, {"login": ["is too long"]})
+        taken_index = ErrorIndex.build(32, {"email": ["has already been taken"]})
+
+        assert long_index.patterns == {Msg.LOGIN_LONG}
+        assert taken_index.patterns == {Msg.EMAIL_TAKEN}
+        assert long_index.matches("PWD_LONG") and long_index.matches("LOGIN_LONG")
+        assert taken_index.matches("LOGIN_TAKEN")
+
+    def test_index_built_once_per_response(self):
+        resp = make_response(200, VALIDATION)
+
+        assert _error_index(resp) is _error_index(resp) is resp.as_error().index
+
+    def test_field_error_uses_index(self):
+        AssertionHelper.assert_field_error(VALIDATION, "login", "TOO LONG")
+        AssertionHelper.assert_field_error(make_response(200, VALIDATION), "email", Msg.EMAIL_INVALID)
+        with pytest.raises(AssertionError):
+            AssertionHelper.assert_field_error(VALIDATION, "email", "too long")
+        with pytest.raises(AssertionError):
+            AssertionHelper.assert_field_error(VALIDATION, "password", "too short")
+
+
+@allure.epic("Test framework")
+@allure.feature("Error index")
+class TestErrorAggregator:
+    """Error classes of bulk runs."""
+
+    def test_groups_by_code_fields_patterns(self):
+        agg = ErrorAggregator(max_samples=2).add_all([
+            VALIDATION,
+            {"error_code": 32, "message": {"email": ["is not a valid email"], "login": ["is too long"]}},
+            {"error_code": 21, "message": "Invalid login or password."},
+            {"login": "bob"},
+        ])
+
+        assert (agg.total, agg.ok) == (4, 1)
+        top = agg.by_count()[0]
+        assert top.count == 2
+        assert top.label == "code=32 fields=email,login msg='not a valid email','too long'"
+        assert len(top.samples) == 2
+        assert agg.code_counts() == {32: 2, 21: 1}
+
+    def test_http_failures_are_errors(self):
+        agg = ErrorAggregator().add_all([
+            make_response(502, "<html><body>Bad Gateway</body></html>", "text/html"),
+            make_response(502, "<html><body>Bad Gateway</body></html>", "text/html"),
+            make_response(429, {"message": "Throttled by network profile"}),
+            make_response(200, '{"login": "bo'),
+            make_response(200, {"login": "bob"}),
+        ])
+
+        assert (agg.total, agg.ok) == (5, 1)
+        labels = {c.label: c.count for c in agg.by_count()}
+        assert labels == {"http=502": 2, "http=429": 1, "http=200": 1}
+        assert "4 errors in 3 classes" in agg.summary()
+
+    def test_error_code_on_failed_status(self):
+        cls = ErrorAggregator().add(make_response(401, {"error_code": 33, "message": "Invalid token"}))
+
+        assert cls.label == "http=401 code=33"
@@ -0,0 +1,75 @@
+"""Health probe tests."""
+import json
+import uuid
+
+import allure
+import requests
+from requests import Response
+from requests.adapters import HTTPAdapter
+
+from api import netem
+from api.health import check_health
+from api.response import APIResponse
+from api.user_api import UserAPI
+from config import DEFAULT_TARGET, Target
+
+
+class BrokenAdapter(HTTPAdapter):
+    def send(self, request, **kwargs):
+        raise requests.ConnectionError("refused")
+
+
+def response(status: int, body=None) -> APIResponse:
+    resp = Response()
+    resp.status_code = status
+    resp.reason = "reason"
+    resp._content = json.dumps(body or {}).encode()
+    resp.encoding = "utf-8"
+    return APIResponse(resp)
+
+
+def client(name=None, network_profile="none") -> UserAPI:
+    target = Target(name or f"t-{uuid.uuid4().hex[:6]}", "http://127.0.0.1:9/api", "key")
+    return UserAPI(network_profile=network_profile, target=target)
+
+
+@allure.epic("Test framework")
+@allure.feature("Health check")
+class TestHealthCheck:
+    """Probe outcomes and the variables named in problems."""
+
+    def test_target_variables(self, monkeypatch):
+        target = Target("stage-eu", "http://x", "key")
+        assert DEFAULT_TARGET.base_url_env == "FAVQS_BASE_URL"
+        assert DEFAULT_TARGET.api_key_env == "FAVQS_API_KEY"
+        assert target.base_url_env == "FAVQS_STAGE_EU_BASE_URL"
+        assert target.api_key_env == "FAVQS_API_KEY"
+
+        monkeypatch.setenv("FAVQS_STAGE_EU_API_KEY", "key")
+        assert target.api_key_env == "FAVQS_STAGE_EU_API_KEY"
+
+    def test_unreachable_names_base_url_variable(self):
+        api = client("stage-eu")
+        api.session.mount("http://", BrokenAdapter())
+        problem = check_health(api)
+
+        assert "unreachable" in problem
+        assert "FAVQS_STAGE_EU_BASE_URL" in problem
+
+    def test_rejected_key_names_api_key_variable(self, monkeypatch):
+        monkeypatch.setenv("FAVQS_STAGE_EU_API_KEY", "key")
+        api = client("stage-eu")
+        monkeypatch.setattr(api, "get", lambda *a, **kw: response(401))
+
+        assert "Check FAVQS_STAGE_EU_API_KEY" in check_health(api)
+
+    def test_emulated_fault_is_not_a_problem(self):
+        api = client(network_profile=netem.NetworkProfile("reset", reset_rate=1.0))
+
+        assert check_health(api) is None
+
+    def test_healthy(self, monkeypatch):
+        api = client()
+        monkeypatch.setattr(api, "get", lambda *a, **kw: response(200, {"quotes": []}))
+
+        assert check_health(api) is None
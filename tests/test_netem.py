@@ -0,0 +1,73 @@
+"""Network emulation tests."""
+import random
+
+import allure
+import pytest
+import requests
+
+from api import netem
+from api.user_api import UserAPI
+
+
+@pytest.fixture
+def lossy_default():
+    previous = netem.get_default_profile()
+    netem.set_default_profile("lossy")
+    yield
+    netem.set_default_profile(previous)
+
+
+@allure.epic("Test framework")
+@allure.feature("Network emulation")
+class TestProfiles:
+    """Profile lookup and latency sampling."""
+
+    def test_get_profile(self):
+        assert netem.get_profile("3g") is netem.PROFILES["3g"]
+        assert netem.get_profile(netem.PROFILES["lan"]) is netem.PROFILES["lan"]
+        assert netem.get_profile(None) is None
+        assert netem.get_profile("none") is None
+
+    def test_unknown_profile(self):
+        with pytest.raises(ValueError):
+            netem.get_profile("dialup")
+
+    @pytest.mark.parametrize("name", sorted(netem.PROFILES))
+    def test_latency_non_negative_and_reproducible(self, name):
+        profile = netem.PROFILES[name]
+        first = [profile.sample_latency(random.Random(1)) for _ in range(50)]
+        second = [profile.sample_latency(random.Random(1)) for _ in range(50)]
+
+        assert first == second
+        assert min(first) >= 0.0
+
+    def test_zero_latency(self):
+        assert netem.NetworkProfile("x").sample_latency(random.Random()) == 0.0
+
+
+@allure.epic("Test framework")
+@allure.feature("Network emulation")
+class TestClientProfile:
+    """Profile selection of API clients."""
+
+    def test_explicit_none_overrides_default(self, lossy_default):
+        client = UserAPI(network_profile="none")
+
+        assert not isinstance(client.session.get_adapter("https://x"), netem.EmulatedAdapter)
+
+    def test_default_used_without_explicit_profile(self, lossy_default):
+        adapter = UserAPI().session.get_adapter("https://x")
+
+        assert isinstance(adapter, netem.EmulatedAdapter)
+        assert adapter.profile is netem.PROFILES["lossy"]
+
+    def test_emulated_faults(self):
+        session = requests.Session()
+        session.mount("http://", netem.EmulatedAdapter(netem.NetworkProfile("reset", reset_rate=1.0)))
+        with pytest.raises(requests.ConnectionError):
+            session.get("http://127.0.0.1:9/")
+
+        session.mount("http://", netem.EmulatedAdapter(netem.NetworkProfile("429", throttle_rate=1.0)))
+        resp = session.get("http://127.0.0.1:9/")
+        assert resp.status_code == 429
+        assert resp.headers["Retry-After"] == "1"
@@ -0,0 +1,72 @@
+"""Per-test profiler tests."""
+import allure
+import pytest
+
+from utils import profiler
+from utils.assertions import AssertionHelper
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def perf_counter(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(profiler, "time", fake)
+    yield fake
+    profiler.results.clear()
+
+
+@allure.epic("Test framework")
+@allure.feature("Profiler")
+class TestTimeBreakdown:
+    """Exclusive time accounting and flamegraph output."""
+
+    def test_self_time_excludes_nested_spans(self, clock):
+        profile = profiler.start_test("tests/test_a.py::test_a")
+        with profiler.span("call"):
+            clock.advance(1.0)
+            with profiler.span("network"):
+                clock.advance(3.0)
+                with profiler.span("json"):
+                    clock.advance(0.5)
+            with profiler.span("allure"):
+                clock.advance(0.25)
+        profiler.stop_test()
+
+        assert dict(profile.categories) == {"call": 1.0, "network": 3.0, "json": 0.5, "allure": 0.25}
+        assert profile.stacks[("call", "network", "json")] == 0.5
+        assert profile.total == 4.75
+        assert profiler.results == [profile]
+
+    def test_collapsed_stacks(self, clock):
+        profile = profiler.start_test("t.py::test[a;b]")
+        with profiler.span("call"):
+            clock.advance(0.002)
+            with profiler.span("network"):
+                clock.advance(0.001)
+        profiler.stop_test()
+
+        assert profiler.collapsed_stacks([profile]) == [
+            "t.py::test[a:b];call 2000",
+            "t.py::test[a:b];call;network 1000",
+        ]
+
+    def test_span_noop_when_off(self):
+        assert profiler.span("network") is profiler.span("json")
+
+    def test_decorator_hidden_from_tracebacks(self):
+        with pytest.raises(AssertionError) as excinfo:
+            AssertionHelper.assert_equal(1, 2, "value")
+
+        frames = [entry.name for entry in excinfo.traceback.filter(excinfo)]
+        assert "wrapper" not in frames
+        assert "assert_equal" in frames
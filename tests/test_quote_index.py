@@ -0,0 +1,144 @@
+"""Local quote index tests."""
+import allure
+import pytest
+
+from models.quote import Quote
+from utils.quote_index import QuoteCorpus, _decode, _encode, tokenize
+
+QUOTES = [
+    Quote(1, "Life is what happens", "John Lennon", ["Life"]),
+    Quote(2, "Be yourself; everyone else is already taken.", "Oscar Wilde", ["funny", "life"]),
+    Quote(3, "I can resist everything except temptation.", "Oscar Wilde", ["funny"]),
+    Quote(4, "Life is really simple", "Confucius", ["wisdom"]),
+]
+
+
+class PagedAPI:
+    """Serves quotes newest first, like GET /quotes."""
+
+    def __init__(self, quotes, size=2):
+        self.quotes = sorted(quotes, key=lambda q: -q.id)
+        self.size = size
+        self.pages = 0
+
+    def get_page(self, page=1, query=None, filter_type=None):
+        self.pages += 1
+        quotes = self.quotes
+        if filter_type == "tag":
+            quotes = [q for q in quotes if query in q.tags]
+        chunk = quotes[(page - 1) * self.size:page * self.size]
+        return chunk, page * self.size >= len(quotes)
+
+
+@pytest.fixture
+def corpus():
+    c = QuoteCorpus()
+    c.add_all(QUOTES)
+    return c
+
+
+@allure.epic("Test framework")
+@allure.feature("Quote index")
+class TestQuoteCorpus:
+    """Indexing, queries and the snapshot file."""
+
+    def test_encode_decode(self):
+        assert _encode({9, 2, 5}) == [2, 3, 4]
+        assert _decode(_encode({9, 2, 5})) == {2, 5, 9}
+
+    def test_tokenize(self):
+        assert tokenize("Don't PANIC, 42!") == ["don't", "panic", "42"]
+
+    def test_queries(self, corpus):
+        assert corpus.query("LIFE", "tag") == {1, 2}
+        assert corpus.query("oscar wilde", "author") == {2, 3}
+        assert corpus.query("life is") == {1, 4}
+        assert corpus.query("life unknown") == frozenset()
+        assert corpus.query("", None) == frozenset()
+        with pytest.raises(ValueError):
+            corpus.query("x", "user")
+
+    def test_postings_frozen_after_add_all(self, corpus):
+        assert all(isinstance(ids, frozenset) for postings in corpus.index.values()
+                   for ids in postings.values())
+        assert not corpus.add(QUOTES[0])
+
+    def test_save_load(self, corpus, tmp_path):
+        path = tmp_path / "snapshot.json.gz"
+        corpus.complete = True
+        corpus.save(path)
+        loaded = QuoteCorpus.load(path)
+
+        assert loaded.quotes == corpus.quotes
+        assert loaded.index == corpus.index
+        assert loaded.complete
+        assert len(QuoteCorpus.load(tmp_path / "absent.json.gz")) == 0
+
+
+@allure.epic("Test framework")
+@allure.feature("Quote index")
+class TestSyncAndVerify:
+    """Incremental sync and filter verification."""
+
+    def test_sync_resumes_and_refreshes(self):
+        corpus = QuoteCorpus()
+        api = PagedAPI(QUOTES)
+
+        assert corpus.sync(api, max_pages=1) == 2
+        assert not corpus.complete
+        assert corpus.sync(api) == 2
+        assert corpus.complete and len(corpus) == 4
+
+        api.quotes.insert(0, Quote(5, "New life", "Anon", ["life"]))
+        assert corpus.sync(api) == 1
+        assert corpus.query("life", "tag") == {1, 2, 5}
+        assert all(isinstance(ids, frozenset) for ids in corpus.index["tag"].values())
+
+    def test_verify(self, corpus):
+        corpus.complete = True
+        diff = corpus.verify(PagedAPI(QUOTES), "funny", "tag")
+
+        assert diff.ok and not diff.truncated
+
+    def test_verify_reports_differences(self, corpus):
+        corpus.complete = True
+        server = [Quote(1, "x", tags=["funny"]), Quote(2, "y", tags=["funny"])]
+        diff = corpus.verify(PagedAPI(server), "funny", "tag")
+
+        assert diff.missing == {3}
+        assert diff.unexpected == {1}
+
+    def test_verify_truncated_skips_missing(self, corpus):
+        corpus.complete = True
+        diff = corpus.verify(PagedAPI(QUOTES, size=1), "funny", "tag", max_pages=1)
+
+        assert diff.truncated
+        assert diff.ok
+
+    def test_sync_refreshes_edited_head_quotes(self):
+        corpus = QuoteCorpus()
+        api = PagedAPI(QUOTES)
+        corpus.sync(api)
+
+        api.quotes[0] = Quote(4, "Life is really simple", "Confucius", ["Zen"])
+        assert corpus.sync(api) == 0
+        assert corpus.refreshed == 1
+        assert corpus.query("zen", "tag") == {4}
+        assert "wisdom" not in corpus.index["tag"]
+        assert all(isinstance(ids, frozenset) for ids in corpus.index["tag"].values())
+
+    def test_remove(self, corpus):
+        assert corpus.remove(3)
+        assert not corpus.remove(3)
+        assert corpus.query("funny", "tag") == {2}
+        assert "temptation" not in corpus.index["word"]
+
+    def test_resync_drops_deleted_quotes(self, corpus):
+        server = [QUOTES[0], QUOTES[1], Quote(3, "I can resist everything", "Oscar Wilde", ["wit"])]
+        changed = corpus.resync(PagedAPI(server))
+
+        assert changed == 2
+        assert corpus.complete and sorted(corpus.quotes) == [1, 2, 3]
+        assert corpus.query("funny", "tag") == {2}
+        assert corpus.query("wit", "tag") == {3}
+        assert corpus.verify(PagedAPI(server), "wit", "tag").ok
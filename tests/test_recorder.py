@@ -0,0 +1,64 @@
+"""Flight recorder tests."""
+import json
+
+import allure
+from requests import Response
+
+from utils.logger import get_logger, log_response
+from utils.recorder import FlightRecorder, start_recording, stop_recording
+
+
+@allure.epic("Test framework")
+@allure.feature("Flight recorder")
+class TestFlightRecorder:
+    """Ring buffer of request/response logs."""
+
+    def test_keeps_last_entries(self):
+        recorder = FlightRecorder(capacity=3)
+        for i in range(5):
+            recorder.record(">>>", f"GET /users/{i}")
+
+        assert [e[2] for e in recorder.entries] == ["GET /users/2", "GET /users/3", "GET /users/4"]
+        assert recorder.dropped == 2
+        assert recorder.dump().startswith("... 2 earlier entries dropped")
+
+    def test_dict_body_stored_truncated(self):
+        big = {"quotes": [{"body": "x" * 100} for _ in range(100)]}
+        recorder = FlightRecorder(max_body=50)
+        recorder.record("<<<", "200 OK", body=big)
+
+        body = recorder.entries[0][4]
+        assert isinstance(body, str) and len(body) == 50
+        assert "truncated" in recorder.dump()
+
+    def test_small_body_pretty_printed_in_dump(self):
+        recorder = FlightRecorder()
+        recorder.record("<<<", "200 OK", body='{"login":"bob"}')
+
+        assert recorder.entries[0][4] == '{"login":"bob"}'
+        assert '"login": "bob"' in recorder.dump()
+
+    def test_response_recorded_as_masked_slice(self):
+        resp = Response()
+        resp.status_code, resp.reason, resp.encoding = 200, "OK", "utf-8"
+        resp._content = json.dumps({"User-Token": "secret-token", "pad": "x" * 1_000_000}).encode()
+        recorder = start_recording()
+        recorder.max_body = 40
+        try:
+            log_response(get_logger("test_recorder"), resp)
+        finally:
+            stop_recording()
+
+        body = recorder.entries[0][4]
+        assert len(body) <= 40
+        assert "secret" not in body and '"User-Token": "***' in body
+        assert f"{len(resp.content)} in total" in recorder.dump()
+
+    def test_clear(self):
+        recorder = FlightRecorder(capacity=1)
+        recorder.record(">>>", "GET /a")
+        recorder.record(">>>", "GET /b")
+        recorder.clear()
+
+        assert not recorder.entries
+        assert recorder.dropped == 0
@@ -0,0 +1,112 @@
+"""Traffic replay tests."""
+import threading
+
+import allure
+
+from utils.replay import TraceEvent, Replayer
+
+
+class StubResponse:
+    status_code = 200
+
+    def as_error(self):
+        return None
+
+
+class StubClient:
+    """Records calls of one replay user instead of sending requests."""
+
+    calls = []
+    lock = threading.Lock()
+
+    def __init__(self, target=None):
+        self.user_token = None
+
+    def _call(self, op, *args):
+        with self.lock:
+            self.calls.append((id(self), threading.get_ident(), op, args))
+        return StubResponse()
+
+    def create_user(self, data):
+        self.user_token = f"token-{data.login}"
+        return self._call("create_user")
+
+    def get_user(self, login, authenticated=False):
+        return self._call("get_user", login, authenticated)
+
+    def update_user(self, login, **fields):
+        return self._call("update_user", login, fields)
+
+    def create_session(self, login, password):
+        self.user_token = f"session-{login}"
+        return self._call("create_session")
+
+    def destroy_session(self):
+        return self._call("destroy_session", self.user_token)
+
+
+def event(ts, user, method, path, body=None):
+    return TraceEvent.from_dict({"ts": ts, "user": user, "method": method, "path": path, "body": body})
+
+
+def run(events, **kwargs):
+    StubClient.calls = []
+    return Replayer(events, factory=StubClient, **kwargs).run()
+
+
+@allure.epic("Test framework")
+@allure.feature("Traffic replay")
+class TestReplayer:
+    """Timing, ordering and session handling of replays."""
+
+    def test_speed_scaling(self):
+        replayer = run([event(0.0, "a", "POST", "/api/users"), event(1.0, "a", "GET", "/api/users/a")],
+                       speed=10)
+
+        assert 0.09 <= replayer.finished - replayer.started < 0.5
+        assert replayer.intended_rate == 20.0
+
+    def test_user_pinned_to_one_worker_in_order(self):
+        events = []
+        for i in range(20):
+            for user in ("alice", "bob", "carol"):
+                events.append(event(i * 0.001, user, "GET", f"/api/users/{user}"))
+        replayer = run(events, speed=100, workers=4)
+
+        for user in replayer.users.values():
+            calls = [c for c in StubClient.calls if c[0] == id(user.client)]
+            assert len({thread for _, thread, _, _ in calls}) == 1
+            assert [op for _, _, op, _ in calls] == ["create_user"] + ["get_user"] * 20
+
+    def test_session_token_reused_and_cleared(self):
+        replayer = run([
+            event(0.0, "alice", "POST", "/api/users"),
+            event(0.001, "alice", "DELETE", "/api/session"),
+            event(0.002, "alice", "GET", "/api/users/alice"),
+            event(0.003, "alice", "POST", "/api/session"),
+            event(0.004, "alice", "GET", "/api/users/alice"),
+        ], speed=100)
+        login = replayer.users["alice"].data.login
+
+        ops = [(op, args) for _, _, op, args in StubClient.calls]
+        assert ops == [
+            ("create_user", ()),
+            ("destroy_session", (f"token-{login}",)),
+            ("get_user", (login, False)),
+            ("create_session", ()),
+            ("get_user", (login, True)),
+        ]
+
+    def test_provisioning_timed_apart(self):
+        replayer = run([event(0.0, "bob", "GET", "/api/users/bob")])
+
+        assert replayer.latency.summary("provision")["count"] == 1
+        assert replayer.latency.summary("get_user")["count"] == 1
+
+    def test_unsupported_skipped(self):
+        replayer = run([event(0.0, "bob", "GET", "/api/quotes"), event(0.001, "bob", "PATCH", "/api/users/bob")])
+
+        assert StubClient.calls == []
+        assert replayer.unsupported == 2
+        assert not replayer.users
+        assert "unsupported" not in replayer.latency.keys()
@@ -0,0 +1,71 @@
+"""Response wrapper tests."""
+import json
+from decimal import Decimal
+
+import allure
+import pytest
+from requests import Response
+
+from api.response import APIResponse
+
+
+def make_response(status: int, content: bytes) -> APIResponse:
+    resp = Response()
+    resp.status_code = status
+    resp.reason = "reason"
+    resp._content = content
+    resp._content_consumed = True
+    resp.encoding = "utf-8"
+    return APIResponse(resp)
+
+
+@allure.epic("Test framework")
+@allure.feature("Response wrapper")
+class TestAPIResponse:
+    """APIResponse as a drop-in for requests.Response."""
+
+    def test_json_decoded_once(self, monkeypatch):
+        resp = make_response(200, json.dumps({"login": "bob"}).encode())
+        calls = []
+        raw_json = resp.raw.json
+        monkeypatch.setattr(resp.raw, "json", lambda **kw: calls.append(kw) or raw_json(**kw))
+
+        assert resp.json() is resp.json()
+        assert len(calls) == 1
+
+    def test_json_kwargs_passed(self):
+        resp = make_response(200, b'{"price": 1.10}')
+
+        assert resp.json(parse_float=Decimal) == {"price": Decimal("1.10")}
+
+    def test_non_json_error_memoized(self):
+        resp = make_response(502, b"<html>Bad Gateway</html>")
+
+        with pytest.raises(ValueError):
+            resp.json()
+        with pytest.raises(ValueError):
+            resp.json()
+        assert resp.json_or_none() is None
+        assert resp.as_error() is None
+
+    @pytest.mark.parametrize("status, ok", [(200, True), (302, True), (404, False), (500, False)])
+    def test_bool(self, status, ok):
+        resp = make_response(status, b"{}")
+
+        assert bool(resp) is ok is bool(resp.raw)
+
+    def test_delegation(self):
+        resp = make_response(200, b"abc")
+
+        assert b"".join(resp) == b"abc"
+        assert resp.text == "abc"
+        with resp as r:
+            assert r is resp
+
+    def test_models(self):
+        error = make_response(200, b'{"error_code": 21, "message": "Invalid login or password."}')
+        user = make_response(200, b'{"login": "bob", "pic_url": "", "public_favorites_count": 0}')
+
+        assert error.as_error().error_code == 21
+        assert user.as_error() is None
+        assert user.as_user().login == "bob"
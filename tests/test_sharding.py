@@ -0,0 +1,91 @@
+"""Sharding tests."""
+import json
+
+import allure
+import pytest
+
+from models.user import set_namespace, unique_id
+from utils import sharding
+
+
+@allure.epic("Test framework")
+@allure.feature("Sharding")
+class TestShardAssignment:
+    """Shard parsing and duration balancing."""
+
+    @pytest.mark.parametrize("value, expected", [("1/1", (1, 1)), ("2/4", (2, 4)), ("99/99", (99, 99))])
+    def test_parse_shard(self, value, expected):
+        assert sharding.parse_shard(value) == expected
+
+    @pytest.mark.parametrize("value", ["0/2", "3/2", "1", "a/b", "1/100"])
+    def test_parse_shard_invalid(self, value):
+        with pytest.raises(ValueError):
+            sharding.parse_shard(value)
+
+    def test_every_test_assigned_once(self):
+        nodeids = [f"t{i}" for i in range(10)]
+        assignment = sharding.assign_shards(nodeids, 3, {})
+
+        assert sorted(assignment) == sorted(nodeids)
+        assert set(assignment.values()) == {1, 2, 3}
+
+    def test_deterministic(self):
+        nodeids = [f"t{i}" for i in range(20)]
+        durations = {f"t{i}": i % 7 + 0.5 for i in range(0, 20, 2)}
+
+        assert sharding.assign_shards(nodeids, 4, durations) == \
+            sharding.assign_shards(list(reversed(nodeids)), 4, durations)
+
+    def test_balanced_by_duration(self):
+        durations = {"slow": 10.0, "a": 3.0, "b": 3.0, "c": 2.0, "d": 2.0}
+        assignment = sharding.assign_shards(list(durations), 2, durations)
+
+        loads = {1: 0.0, 2: 0.0}
+        for nodeid, index in assignment.items():
+            loads[index] += durations[nodeid]
+        assert sorted(loads.values()) == [10.0, 10.0]
+
+
+@allure.epic("Test framework")
+@allure.feature("Sharding")
+class TestShardNamespace:
+    """Generated ids of parallel shards."""
+
+    def teardown_method(self):
+        set_namespace("")
+
+    def test_namespaces_prefix_free(self):
+        namespaces = [sharding.shard_namespace(i) for i in range(1, sharding.MAX_SHARDS + 1)]
+
+        assert len({len(ns) for ns in namespaces}) == 1
+        assert len(set(namespaces)) == len(namespaces)
+
+    def test_random_part_fixed(self):
+        set_namespace(sharding.shard_namespace(12))
+
+        assert len(unique_id(3)) == 6
+        assert unique_id().startswith("s12")
+        assert len(f"testuser_{unique_id()}") <= 20
+
+
+@allure.epic("Test framework")
+@allure.feature("Sharding")
+class TestMerge:
+    """Merging shard bundles."""
+
+    def test_merge(self, tmp_path):
+        bundles = []
+        for i in (1, 2):
+            bundle = tmp_path / f"shard-{i}-of-2"
+            (bundle / "allure-results").mkdir(parents=True)
+            (bundle / "allure-results" / f"{i}-result.json").write_text("{}")
+            sharding.save_durations(bundle / "durations.json", {f"t{i}": float(i)})
+            bundles.append(bundle)
+        out = tmp_path / "merged"
+        durations = tmp_path / "durations.json"
+
+        assert sharding.merge(bundles, out, durations) == 2
+        assert sorted(p.name for p in out.iterdir()) == ["1-result.json", "2-result.json"]
+        assert json.loads(durations.read_text()) == {"t1": 1.0, "t2": 2.0}
+
+        assert sharding.merge(bundles, out, durations) == 0
@@ -0,0 +1,109 @@
+"""Soak runner tests."""
+import allure
+import pytest
+import requests
+from requests import Response
+
+from api.circuit_breaker import CircuitOpenError
+from api.response import APIResponse
+from utils.soak import Sample, SoakReport, SoakRunner, Thresholds, pooled_connections
+
+
+def make_response(status: int, content: bytes = b"{}") -> APIResponse:
+    resp = Response()
+    resp.status_code = status
+    resp._content = content
+    resp._content_consumed = True
+    resp.encoding = "utf-8"
+    return APIResponse(resp)
+
+
+class StubClient:
+    """Answers the profile_read flow with canned responses."""
+
+    def __init__(self, create=None, get=None):
+        self.session = requests.Session()
+        self.create = create or make_response(200, b'{"User-Token": "t"}')
+        self.get = get or (lambda: make_response(200))
+        self.user_token = None
+
+    def create_user(self, data):
+        return self.create
+
+    def get_user(self, login, authenticated=False):
+        return self.get()
+
+
+def runner(client=None, **kwargs) -> SoakRunner:
+    kwargs.setdefault("iterations", 3)
+    return SoakRunner("profile_read", warmup=0, client=client or StubClient(), **kwargs)
+
+
+def sample(iteration, fds=10, connections=1) -> Sample:
+    return Sample(iteration, float(iteration), 0, None, fds, connections)
+
+
+@allure.epic("Test framework")
+@allure.feature("Soak runner")
+class TestSoakRunner:
+    """Error counting, aborts and leak thresholds."""
+
+    def test_check_within_thresholds(self):
+        report = SoakReport("profile_read", samples=[sample(0), sample(100, fds=12, connections=3)])
+        runner(thresholds=Thresholds(heap_growth=1024, fd_growth=2, connection_growth=2))._check(report, 1024)
+
+        assert report.ok
+
+    def test_check_reports_every_threshold(self):
+        report = SoakReport("profile_read", samples=[sample(0), sample(100, fds=13, connections=4)])
+        runner(thresholds=Thresholds(heap_growth=1024, fd_growth=2, connection_growth=2))._check(report, 1025)
+
+        assert len(report.failures) == 3
+        assert "heap" in report.failures[0]
+        assert "10 -> 13" in report.failures[1]
+        assert "1 -> 4" in report.failures[2]
+
+    def test_check_skips_fds_without_proc(self):
+        report = SoakReport("profile_read", samples=[sample(0, fds=None), sample(100, fds=None)])
+        runner()._check(report, 0)
+
+        assert report.ok
+
+    def test_pooled_connections(self):
+        client = StubClient()
+        assert pooled_connections(client) == 0
+
+        pool = client.session.get_adapter("http://").poolmanager.connection_from_url("http://example.com")
+        pool._get_conn()  # creates an unconnected HTTPConnection
+        pool._get_conn()
+        assert pooled_connections(client) == 2
+
+    def test_error_responses_counted(self):
+        responses = iter([make_response(404), make_response(200, b'{"error_code": 20, "message": "x"}'),
+                          make_response(200)])
+        report = runner(StubClient(get=lambda: next(responses))).run()
+
+        assert report.errors == 2
+
+    def test_transport_errors_counted(self):
+        def get():
+            raise requests.ConnectionError("reset")
+        report = runner(StubClient(get=get)).run()
+
+        assert report.errors == 3
+
+    def test_circuit_open_aborts_run(self):
+        calls = []
+
+        def get():
+            calls.append(1)
+            raise CircuitOpenError("circuit open")
+        report = runner(StubClient(get=get), iterations=100).run()
+
+        assert len(calls) == 1
+        assert not report.ok and "circuit open" in report.failures[0]
+
+    def test_failed_setup_raises(self):
+        client = StubClient(create=make_response(200, b'{"error_code": 32, "message": "Login taken"}'))
+        with pytest.raises(RuntimeError, match="create_user"):
+            runner(client).run()
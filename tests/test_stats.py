@@ -0,0 +1,53 @@
+"""Latency statistics and trace parsing tests."""
+import allure
+import pytest
+
+from utils.replay import TraceEvent
+from utils.stats import LatencyStats, percentile
+
+
+@allure.epic("Test framework")
+@allure.feature("Latency stats")
+class TestPercentile:
+    """Nearest-rank percentiles."""
+
+    @pytest.mark.parametrize("q, expected", [(0, 1), (10, 1), (50, 5), (90, 9), (95, 10), (100, 10)])
+    def test_nearest_rank(self, q, expected):
+        assert percentile(list(range(1, 11)), q) == expected
+
+    def test_empty(self):
+        assert percentile([], 95) == 0.0
+
+    def test_single(self):
+        assert percentile([0.25], 99) == 0.25
+
+    def test_summary(self):
+        stats = LatencyStats()
+        for ms in range(1, 101):
+            stats.add("get_user", ms / 1000, error=ms > 98)
+
+        s = stats.summary("get_user")
+        assert (s["count"], s["errors"]) == (100, 2)
+        assert s["p50"] == pytest.approx(0.05)
+        assert s["p95"] == pytest.approx(0.095)
+        assert s["max"] == pytest.approx(0.1)
+        assert stats.summary("missing")["count"] == 0
+
+
+@allure.epic("Test framework")
+@allure.feature("Traffic replay")
+class TestTraceEvent:
+    """Mapping of access-log lines to replayed operations."""
+
+    @pytest.mark.parametrize("method, path, endpoint", [
+        ("post", "/api/users", "create_user"),
+        ("GET", "/api/users/alice?x=1", "get_user"),
+        ("PUT", "/api/users/alice/", "update_user"),
+        ("POST", "/api/session", "create_session"),
+        ("DELETE", "/api/session", "destroy_session"),
+        ("GET", "/api/quotes", "unsupported"),
+    ])
+    def test_endpoint(self, method, path, endpoint):
+        event = TraceEvent.from_dict({"ts": 1, "user": "alice", "method": method, "path": path})
+
+        assert event.endpoint == endpoint
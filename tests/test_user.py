@@ -5,8 +5,7 @@ import allure
 import pytest
 
 from api.error_codes import ErrorCode, Msg
-from api.user_api import UserAPI
-from models.user import UserData, UserResponse
+from models.user import UserData, unique_id
 
 
 @allure.epic("FavQs API")
@@ -32,7 +31,7 @@ class TestUserCreation:
             resp = api_client.get_user(user_data.login, authenticated=True)
             check.assert_status_code(resp, 200)
 
-        user = UserResponse.from_dict(resp.json())
+        user = resp.as_user()
         check.assert_equal(user.login, user_data.login, "login")
         check.assert_equal(user.email, user_data.email, "email")
 
@@ -53,9 +52,8 @@ class TestUserCreationNegative:
         resp = client.post("/users", data={"user": new_user.to_dict()}, authenticated=True)
 
         check.assert_status_code(resp, 200)
-        data = resp.json()
-        check.assert_error_code(data, ErrorCode.SESSION_EXISTS)
-        check.assert_error_message_contains(data, Msg.SESSION)
+        check.assert_error_code(resp, ErrorCode.SESSION_EXISTS)
+        check.assert_error_message_contains(resp, Msg.SESSION)
 
     @allure.story("Registration")
     @allure.title("Invalid email")
@@ -66,9 +64,8 @@ class TestUserCreationNegative:
         resp = api_client.create_user(user)
 
         check.assert_status_code(resp, 200)
-        data = resp.json()
-        check.assert_validation_error(data, "email")
-        check.assert_error_message_contains(data, Msg.EMAIL_INVALID)
+        check.assert_validation_error(resp, "email")
+        check.assert_error_message_contains(resp, Msg.EMAIL_INVALID)
 
     @allure.story("Registration")
     @allure.title("Short password")
@@ -79,9 +76,8 @@ class TestUserCreationNegative:
         resp = api_client.create_user(user)
 
         check.assert_status_code(resp, 200)
-        data = resp.json()
-        check.assert_validation_error(data, "password")
-        check.assert_error_message_contains(data, Msg.PWD_SHORT)
+        check.assert_validation_error(resp, "password")
+        check.assert_error_message_contains(resp, Msg.PWD_SHORT)
 
     @allure.story("Registration")
     @allure.title("Special chars in login")
@@ -92,9 +88,8 @@ class TestUserCreationNegative:
         resp = api_client.create_user(user)
 
         check.assert_status_code(resp, 200)
-        data = resp.json()
-        check.assert_error_code(data, ErrorCode.VALIDATION_ERROR)
-        check.assert_error_message_contains(data, Msg.LOGIN_CHARS)
+        check.assert_error_code(resp, ErrorCode.VALIDATION_ERROR)
+        check.assert_error_message_contains(resp, Msg.LOGIN_CHARS)
 
     @allure.story("Registration")
     @allure.title("Login too long")
@@ -105,14 +100,13 @@ class TestUserCreationNegative:
         resp = api_client.create_user(user)
 
         check.assert_status_code(resp, 200)
-        data = resp.json()
-        check.assert_error_code(data, ErrorCode.VALIDATION_ERROR)
-        check.assert_error_message_contains(data, Msg.LOGIN_LONG)
+        check.assert_error_code(resp, ErrorCode.VALIDATION_ERROR)
+        check.assert_error_message_contains(resp, Msg.LOGIN_LONG)
 
     @allure.story("Registration")
     @allure.title("Duplicate login")
     @pytest.mark.regression
-    def test_duplicate_login(self, created_user, check):
+    def test_duplicate_login(self, created_user, api_factory, check):
         """Should fail when login already taken."""
         _, existing = created_user
 
@@ -122,14 +116,13 @@ class TestUserCreationNegative:
             password="Test123"
         )
 
-        new_client = UserAPI()
+        new_client = api_factory()
         resp = new_client.create_user(dup)
 
         check.assert_status_code(resp, 200)
-        data = resp.json()
-        check.assert_error_code(data, ErrorCode.VALIDATION_ERROR)
-        check.assert_error_message_contains(data, Msg.LOGIN_CHARS)
-        check.assert_error_message_contains(data, Msg.LOGIN_TAKEN)
+        check.assert_error_code(resp, ErrorCode.VALIDATION_ERROR)
+        check.assert_error_message_contains(resp, Msg.LOGIN_CHARS)
+        check.assert_error_message_contains(resp, Msg.LOGIN_TAKEN)
 
 
 @allure.epic("FavQs API")
@@ -155,7 +148,7 @@ class TestUserCreationBoundary:
     @allure.title("Max login length (20 chars)")
     @pytest.mark.regression
     def test_max_login(self, api_client, check):
-        uid = uuid.uuid4().hex[:12]
+        uid = unique_id(12)
         login = f"max_{uid}"[:20].ljust(20, 'x')
         user = UserData(login=login, email=f"max_{uid}@test.com", password="Test123")
 
@@ -204,7 +197,7 @@ class TestUserUpdate:
         resp = client.get_user(updated_user_data.login, authenticated=True)
         check.assert_status_code(resp, 200)
 
-        user = UserResponse.from_dict(resp.json())
+        user = resp.as_user()
         check.assert_equal(user.login, updated_user_data.login, "login")
         check.assert_equal(user.email, updated_user_data.email, "email")
 
@@ -218,7 +211,7 @@ class TestUserUpdate:
         check.assert_status_code(resp, 200)
 
         resp = client.get_user(original.login, authenticated=True)
-        user = UserResponse.from_dict(resp.json())
+        user = resp.as_user()
         check.assert_equal(user.login, original.login, "login")
         check.assert_equal(user.email, unique_email, "email")
 
@@ -232,7 +225,7 @@ class TestUserUpdate:
         resp = api_client.update_user(user_data.login, pic="")
 
         check.assert_status_code(resp, 200)
-        check.assert_success_message(resp.json())
+        check.assert_success_message(resp)
 
     @allure.story("Profile Update")
     @allure.title("Toggle profanity filter")
@@ -245,7 +238,7 @@ class TestUserUpdate:
         resp = api_client.update_user(user_data.login, profanity_filter=value)
 
         check.assert_status_code(resp, 200)
-        check.assert_success_message(resp.json())
+        check.assert_success_message(resp)
 
     @allure.story("Profile Update")
     @allure.title("Invalid pic value")
@@ -257,9 +250,8 @@ class TestUserUpdate:
         resp = api_client.update_user(user_data.login, pic="bad_value")
 
         check.assert_status_code(resp, 200)
-        data = resp.json()
-        check.assert_error_code(data, ErrorCode.VALIDATION_ERROR)
-        check.assert_error_message_contains(data, Msg.PIC_INVALID)
+        check.assert_error_code(resp, ErrorCode.VALIDATION_ERROR)
+        check.assert_error_message_contains(resp, Msg.PIC_INVALID)
 
     @allure.story("Profile Update")
     @allure.title("Facebook pic without username")
@@ -271,9 +263,8 @@ class TestUserUpdate:
         resp = api_client.update_user(user_data.login, pic="facebook")
 
         check.assert_status_code(resp, 200)
-        data = resp.json()
-        check.assert_error_code(data, ErrorCode.VALIDATION_ERROR)
-        check.assert_error_message_contains(data, Msg.PIC_INVALID)
+        check.assert_error_code(resp, ErrorCode.VALIDATION_ERROR)
+        check.assert_error_message_contains(resp, Msg.PIC_INVALID)
 
 
 @allure.epic("FavQs API")
@@ -284,9 +275,9 @@ class TestUserRetrieval:
     @allure.story("User Info")
     @allure.title("Get without session")
     @pytest.mark.regression
-    def test_get_without_session(self, created_user, check):
+    def test_get_without_session(self, created_user, api_factory, check):
         _, user_data = created_user
-        client = UserAPI()
+        client = api_factory()
 
         resp = client.get_user(user_data.login, authenticated=False)
 
@@ -366,15 +357,15 @@ class TestSession:
 
         resp = api_client.create_session(user_data.login, user_data.password)
         check.assert_status_code(resp, 200)
-        check.assert_contains_key(resp.json(), "User-Token")
+        check.assert_contains_key(resp, "User-Token")
 
     @allure.story("Auth")
     @allure.title("Wrong password")
     @allure.severity(allure.severity_level.CRITICAL)
     @pytest.mark.regression
-    def test_wrong_password(self, created_user, check):
+    def test_wrong_password(self, created_user, api_factory, check):
         _, user_data = created_user
-        client = UserAPI()
+        client = api_factory()
 
         resp = client.create_session(user_data.login, "WrongPass123")
 
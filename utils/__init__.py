@@ -1,5 +1,6 @@
 """Utilities package."""
 from utils.logger import get_logger, log_request, log_response
 from utils.assertions import AssertionHelper
+from utils.recorder import FlightRecorder, get_recorder
 
-__all__ = ["get_logger", "log_request", "log_response", "AssertionHelper"]
+__all__ = ["get_logger", "log_request", "log_response", "AssertionHelper", "FlightRecorder", "get_recorder"]
@@ -1,17 +1,49 @@
 """Assertion helpers for API tests."""
-from typing import Any, Union
+from typing import TYPE_CHECKING, Any, Union
 
 import allure
 from requests import Response
 
 from api.error_codes import ErrorCode, Msg
+from utils.profiler import profiled
+
+# api.response and models.response import the utils package, which imports
+# this module: they are imported where used
+if TYPE_CHECKING:
+    from api.response import APIResponse
+    from models.response import ErrorIndex
+
+Body = Union[dict, "APIResponse"]
+
+
+def _body(data: Body) -> dict:
+    """Decoded body of a wrapped response; dicts pass through."""
+    from api.response import APIResponse
+
+    if isinstance(data, APIResponse):
+        return data.json()
+    return data
+
+
+def _error_index(data: Body) -> "ErrorIndex":
+    """Error index of a body; memoized on wrapped responses."""
+    from api.response import APIResponse
+    from models.response import ErrorIndex
+
+    if isinstance(data, APIResponse):
+        error = data.as_error()
+        if error is not None:
+            return error.index
+        data = data.json()
+    return ErrorIndex.build(data.get("error_code"), data.get("message", ""))
 
 
 class AssertionHelper:
     """Common assertions with Allure integration."""
 
     @staticmethod
-    def assert_status_code(response: Response, expected: int, msg: str = ""):
+    @profiled("allure")
+    def assert_status_code(response: Union[Response, "APIResponse"], expected: int, msg: str = ""):
         with allure.step(f"Check status code is {expected}"):
             actual = response.status_code
             err = f"Expected {expected}, got {actual}"
@@ -22,81 +54,88 @@ class AssertionHelper:
             assert actual == expected, err
 
     @staticmethod
+    @profiled("allure")
     def assert_equal(actual: Any, expected: Any, name: str):
         with allure.step(f"Check {name} == '{expected}'"):
             assert actual == expected, f"{name}: expected '{expected}', got '{actual}'"
 
     @staticmethod
+    @profiled("allure")
     def assert_not_none(value: Any, name: str):
         with allure.step(f"Check {name} is present"):
             assert value is not None, f"{name} is None"
 
     @staticmethod
-    def assert_contains_key(data: dict, key: str, msg: str = ""):
+    @profiled("allure")
+    def assert_contains_key(data: Body, key: str, msg: str = ""):
         with allure.step(f"Check '{key}' in response"):
+            data = _body(data)
             err = f"'{key}' not found"
             if msg:
                 err = f"{msg}: {err}"
             assert key in data, err
 
     @staticmethod
-    def assert_error_code(data: dict, expected: Union[int, ErrorCode]):
+    @profiled("allure")
+    def assert_error_code(data: Body, expected: Union[int, ErrorCode]):
         code = int(expected)
         with allure.step(f"Check error_code == {code}"):
+            data = _body(data)
             assert "error_code" in data, f"No error_code: {data}"
             assert data["error_code"] == code, f"Expected {code}, got {data['error_code']}"
 
     @staticmethod
     def _msg_to_str(message) -> str:
-        if isinstance(message, str):
-            return message
-        if isinstance(message, dict):
-            parts = []
-            for field, errors in message.items():
-                errs = errors if isinstance(errors, list) else [errors]
-                parts.extend(f"{field}: {e}" for e in errs)
-            return "; ".join(parts)
-        return str(message)
+        from models.response import message_to_str
+
+        return message_to_str(message)
 
     @staticmethod
-    def assert_error_message_contains(data: dict, text: str):
+    @profiled("allure")
+    def assert_error_message_contains(data: Body, text: str):
         with allure.step(f"Check message contains '{text}'"):
-            assert "message" in data, f"No message: {data}"
-            msg_str = AssertionHelper._msg_to_str(data["message"])
-            assert text.lower() in msg_str.lower(), f"'{text}' not in '{msg_str}'"
+            body = _body(data)
+            assert "message" in body, f"No message: {body}"
+            index = _error_index(data)
+            assert index.contains(text), f"'{text}' not in '{index.text}'"
 
     @staticmethod
-    def assert_validation_error(data: dict, field: str):
+    @profiled("allure")
+    def assert_validation_error(data: Body, field: str):
         with allure.step(f"Check validation error for '{field}'"):
-            assert "error_code" in data, f"No error_code: {data}"
-            assert data["error_code"] == ErrorCode.VALIDATION_ERROR, \
-                f"Expected {ErrorCode.VALIDATION_ERROR}, got {data['error_code']}"
-            assert "message" in data, f"No message: {data}"
-
-            msg = data["message"]
-            if isinstance(msg, dict):
-                assert field.lower() in [k.lower() for k in msg.keys()], \
-                    f"'{field}' not in {list(msg.keys())}"
+            body = _body(data)
+            assert "error_code" in body, f"No error_code: {body}"
+            index = _error_index(data)
+            assert index.code == ErrorCode.VALIDATION_ERROR, \
+                f"Expected {ErrorCode.VALIDATION_ERROR}, got {body['error_code']}"
+            assert "message" in body, f"No message: {body}"
+
+            msg = body["message"]
+            if index.structured:
+                assert index.has_field(field), f"'{field}' not in {list(msg.keys())}"
             else:
-                assert field.lower() in str(msg).lower(), f"'{field}' not in '{msg}'"
+                assert index.has_field(field), f"'{field}' not in '{msg}'"
 
     @staticmethod
-    def assert_field_error(data: dict, field: str, error: str):
+    @profiled("allure")
+    def assert_field_error(data: Body, field: str, error: str):
         with allure.step(f"Check '{field}' error contains '{error}'"):
-            assert "message" in data, f"No message: {data}"
-            msg = data["message"]
-
-            if isinstance(msg, dict):
-                assert field in msg, f"'{field}' not in {list(msg.keys())}"
-                errs = msg[field]
-                err_str = " ".join(errs) if isinstance(errs, list) else str(errs)
-                assert error.lower() in err_str.lower(), f"'{error}' not in {errs}"
+            body = _body(data)
+            assert "message" in body, f"No message: {body}"
+            index = _error_index(data)
+
+            if index.structured:
+                assert index.has_field(field), f"'{field}' not in {list(index.fields)}"
+                errs = index.fields[field.lower()]
+                assert error.lower() in " ".join(errs), f"'{error}' not in {list(errs)}"
             else:
-                assert error.lower() in str(msg).lower(), f"'{error}' not in '{msg}'"
+                assert index.contains(error), f"'{error}' not in '{index.text}'"
 
     @staticmethod
-    def assert_success_message(data: dict, text: str = Msg.UPDATED):
+    @profiled("allure")
+    def assert_success_message(data: Body, text: str = Msg.UPDATED):
         with allure.step(f"Check success message"):
+            data = _body(data)
             assert "message" in data, f"No message: {data}"
             assert "error_code" not in data, f"Got error: {data}"
             assert text.lower() in data["message"].lower(), \
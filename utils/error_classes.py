@@ -0,0 +1,105 @@
+"""Grouping of error responses from bulk runs into error classes."""
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Iterable, Optional, Tuple, Union
+
+from api.response import APIResponse
+from models.response import ErrorIndex, ErrorResponse
+
+ErrorSource = Union[APIResponse, ErrorResponse, dict]
+SAMPLE_CHARS = 120
+
+
+@dataclass
+class ErrorClass:
+    """Responses sharing HTTP failure, error code, fields and message patterns."""
+    error_code: Optional[int]
+    fields: tuple
+    patterns: tuple
+    status: Optional[int] = None  # set for non-2xx and non-JSON responses
+    count: int = 0
+    samples: list = field(default_factory=list)
+
+    @property
+    def label(self) -> str:
+        parts = [f"http={self.status}"] if self.status is not None else []
+        if self.error_code is not None or self.status is None:
+            parts.append(f"code={self.error_code if self.error_code is not None else '-'}")
+        if self.fields:
+            parts.append("fields=" + ",".join(self.fields))
+        if self.patterns:
+            parts.append("msg=" + ",".join(f"'{p}'" for p in self.patterns))
+        return " ".join(parts)
+
+
+def _classify(item: ErrorSource) -> Tuple[Optional[int], Optional[ErrorIndex], str]:
+    """(failed HTTP status, error index, sample text); status and index are None for successes."""
+    if isinstance(item, APIResponse):
+        error = item.as_error()
+        index = error.index if error is not None else None
+        if 200 <= item.status_code < 300 and item.json_or_none() is not None:
+            return None, index, index.text if index else ""
+        text = index.text if index else " ".join(item.text[:SAMPLE_CHARS].split())
+        return item.status_code, index, text or item.reason
+    if isinstance(item, dict):
+        item = ErrorResponse.from_dict(item)
+    index = item.index if item is not None else None
+    return None, index, index.text if index else ""
+
+
+class ErrorAggregator:
+    """Counts error classes over a stream of responses.
+
+    Each response is indexed once; only up to max_samples distinct
+    message strings are kept per class, so memory does not grow with the stream.
+    Non-2xx and non-JSON responses (gateway pages, 429s, truncated bodies)
+    are errors too, classed by HTTP status.
+    """
+
+    def __init__(self, max_samples: int = 3):
+        self.max_samples = max_samples
+        self.classes = {}
+        self.total = 0
+        self.ok = 0
+
+    def add(self, item: ErrorSource) -> Optional[ErrorClass]:
+        """Classify one response; returns None for non-errors."""
+        self.total += 1
+        status, index, text = _classify(item)
+        if status is None and index is None:
+            self.ok += 1
+            return None
+
+        if index is None:
+            key = (None, (), (), status)
+        else:
+            key = (index.error_code, tuple(sorted(index.fields)), tuple(sorted(index.patterns)), status)
+        cls = self.classes.get(key)
+        if cls is None:
+            cls = self.classes[key] = ErrorClass(*key)
+        cls.count += 1
+        if len(cls.samples) < self.max_samples and text not in cls.samples:
+            cls.samples.append(text)
+        return cls
+
+    def add_all(self, items: Iterable[ErrorSource]) -> "ErrorAggregator":
+        for item in items:
+            self.add(item)
+        return self
+
+    def by_count(self) -> list:
+        return sorted(self.classes.values(), key=lambda c: (-c.count, c.label))
+
+    def code_counts(self) -> Counter:
+        counts = Counter()
+        for cls in self.classes.values():
+            counts[cls.error_code] += cls.count
+        return counts
+
+    def summary(self) -> str:
+        lines = [f"{self.total} responses, {self.ok} ok, {self.total - self.ok} errors "
+                 f"in {len(self.classes)} classes"]
+        for cls in self.by_count():
+            lines.append(f"{cls.count:>8}  {cls.label}")
+            lines.extend(f"          e.g. {s}" for s in cls.samples)
+        return "\n".join(lines)
@@ -1,10 +1,14 @@
 """Logging utils."""
 import logging
 import json
+import re
+
+from utils.recorder import get_recorder
 
 
 LOG_FMT = "%(asctime)s | %(levelname)-8s | %(name)s | %(message)s"
 DATE_FMT = "%Y-%m-%d %H:%M:%S"
+USER_TOKEN_VALUE = re.compile(r'("User-Token"\s*:\s*")[^"]*')
 
 
 def get_logger(name):
@@ -26,28 +30,65 @@ def _fmt_json(data):
         return str(data)
 
 
+def _safe_headers(headers):
+    return {k: "***" if "token" in k.lower() or k.lower() == "authorization" else v
+            for k, v in headers.items()}
+
+
+def _safe_request_body(body):
+    safe_body = body.copy() if isinstance(body, dict) else body
+    if isinstance(safe_body, dict) and "user" in safe_body:
+        u = safe_body["user"].copy()
+        if "password" in u:
+            u["password"] = "***"
+        safe_body["user"] = u
+    return safe_body
+
+
+def _safe_response_body(response):
+    try:
+        body = response.json()
+    except ValueError:
+        return response.text[:500]
+    if isinstance(body, dict) and "User-Token" in body:
+        body = body.copy()
+        body["User-Token"] = "***"
+    return body
+
+
+def _safe_response_text(response, limit):
+    """Start of the body with the session token masked; cost depends on limit, not the body."""
+    head = response.content[:limit * 4].decode(response.encoding or "utf-8", errors="replace")
+    return USER_TOKEN_VALUE.sub(r"\1***", head[:limit])
+
+
 def log_request(logger, method, url, headers=None, body=None):
-    logger.info(f">>> REQUEST: {method} {url}")
+    line = f"{method} {url}"
+    logger.info(f">>> REQUEST: {line}")
+    recorder = get_recorder()
+    if recorder is not None:
+        recorder.record(
+            ">>>", line,
+            _safe_headers(headers) if headers else None,
+            _safe_request_body(body) if body else None,
+        )
+        return
+    if not logger.isEnabledFor(logging.DEBUG):
+        return
     if headers:
-        safe = {k: "***" if "token" in k.lower() else v for k, v in headers.items()}
-        logger.debug(f"Headers: {safe}")
+        logger.debug(f"Headers: {_safe_headers(headers)}")
     if body:
-        safe_body = body.copy() if isinstance(body, dict) else body
-        if isinstance(safe_body, dict) and "user" in safe_body:
-            u = safe_body["user"].copy()
-            if "password" in u:
-                u["password"] = "***"
-            safe_body["user"] = u
-        logger.debug(f"Body: {_fmt_json(safe_body)}")
+        logger.debug(f"Body: {_fmt_json(_safe_request_body(body))}")
 
 
 def log_response(logger, response):
-    logger.info(f"<<< RESPONSE: {response.status_code} {response.reason}")
-    try:
-        body = response.json()
-        if isinstance(body, dict) and "User-Token" in body:
-            body = body.copy()
-            body["User-Token"] = "***"
-        logger.debug(f"Body: {_fmt_json(body)}")
-    except ValueError:
-        logger.debug(f"Body: {response.text[:500]}")
+    line = f"{response.status_code} {response.reason}"
+    logger.info(f"<<< RESPONSE: {line}")
+    recorder = get_recorder()
+    if recorder is not None:
+        recorder.record("<<<", line, body=_safe_response_text(response, recorder.max_body),
+                        size=len(response.content))
+        return
+    if logger.isEnabledFor(logging.DEBUG):
+        body = _safe_response_body(response)
+        logger.debug(f"Body: {body if isinstance(body, str) else _fmt_json(body)}")
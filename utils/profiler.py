@@ -0,0 +1,113 @@
+"""Per-test wall time attribution by category.
+
+Code marks its work with span("network"), span("json") etc. Time is
+accounted exclusively: a span's self time excludes nested spans. When
+profiling is off, span() returns a shared no-op context manager.
+"""
+import threading
+import time
+from collections import defaultdict
+from contextlib import nullcontext
+from functools import wraps
+
+_NULL = nullcontext()
+
+
+class TimeBreakdown:
+    """Self time of one test by category and by category stack."""
+
+    def __init__(self, nodeid: str):
+        self.nodeid = nodeid
+        self.categories = defaultdict(float)
+        self.stacks = defaultdict(float)
+        self.total = 0.0
+        self._lock = threading.Lock()
+
+    def add(self, stack: tuple, self_time: float):
+        with self._lock:
+            self.categories[stack[-1]] += self_time
+            self.stacks[stack] += self_time
+
+
+class _Span:
+    __slots__ = ("profile", "category", "start", "child")
+
+    def __init__(self, profile: TimeBreakdown, category: str):
+        self.profile = profile
+        self.category = category
+
+    def __enter__(self):
+        self.child = 0.0
+        _stack().append(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.start
+        stack = _stack()
+        path = tuple(s.category for s in stack)
+        stack.pop()
+        if stack:
+            stack[-1].child += elapsed
+        self.profile.add(path, elapsed - self.child)
+        return False
+
+
+_local = threading.local()
+_current = None
+results = []
+
+
+def _stack() -> list:
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+    return stack
+
+
+def start_test(nodeid: str) -> TimeBreakdown:
+    global _current
+    _current = TimeBreakdown(nodeid)
+    _current.total = -time.perf_counter()
+    return _current
+
+
+def stop_test():
+    global _current
+    if _current is None:
+        return
+    _current.total += time.perf_counter()
+    results.append(_current)
+    _current = None
+
+
+def span(category: str):
+    """Context manager attributing its time to category."""
+    profile = _current
+    if profile is None:
+        return _NULL
+    return _Span(profile, category)
+
+
+def profiled(category: str):
+    """Decorator form of span()."""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            __tracebackhide__ = True  # keep assertion tracebacks pointing at the test
+            with span(category):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def collapsed_stacks(profiles) -> list:
+    """Lines in flamegraph collapsed format, counts in microseconds."""
+    lines = []
+    for p in profiles:
+        root = p.nodeid.replace(";", ":")
+        for stack, seconds in sorted(p.stacks.items()):
+            us = round(seconds * 1_000_000)
+            if us > 0:
+                lines.append(f"{root};{';'.join(stack)} {us}")
+    return lines
@@ -0,0 +1,78 @@
+"""Pytest plugin: per-test time breakdown.
+
+    pytest --profile-tests
+    pytest --profile-tests --profile-collapsed=profile.folded
+    flamegraph.pl profile.folded > profile.svg
+"""
+from collections import defaultdict
+
+import pytest
+
+from utils import profiler
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("profile", "per-test time breakdown")
+    group.addoption("--profile-tests", action="store_true", default=False,
+                    help="attribute test time to setup, network, json, allure and logging")
+    group.addoption("--profile-top", type=int, default=10,
+                    help="slowest tests shown in the summary")
+    group.addoption("--profile-collapsed", default=None, metavar="PATH",
+                    help="write collapsed stacks for flamegraph tools")
+
+
+def _enabled(config) -> bool:
+    return config.getoption("--profile-tests") or bool(config.getoption("--profile-collapsed"))
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_protocol(item, nextitem):
+    if not _enabled(item.config):
+        yield
+        return
+    profiler.start_test(item.nodeid)
+    yield
+    profiler.stop_test()
+
+
+def _phase(name):
+    @pytest.hookimpl(hookwrapper=True)
+    def hook(item):
+        with profiler.span(name):
+            yield
+    return hook
+
+
+pytest_runtest_setup = _phase("setup")
+pytest_runtest_call = _phase("call")
+pytest_runtest_teardown = _phase("teardown")
+
+
+def _fmt(categories) -> str:
+    items = sorted(categories.items(), key=lambda kv: -kv[1])
+    return "  ".join(f"{name}={seconds * 1000:.1f}ms" for name, seconds in items if seconds >= 0.0001)
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    if not _enabled(config) or not profiler.results:
+        return
+    results = profiler.results
+
+    totals = defaultdict(float)
+    for p in results:
+        for name, seconds in p.categories.items():
+            totals[name] += seconds
+
+    tr = terminalreporter
+    tr.write_sep("=", "test time breakdown")
+    tr.write_line(f"all {len(results)} tests: {_fmt(totals)}")
+    top = config.getoption("--profile-top")
+    for p in sorted(results, key=lambda p: -p.total)[:top]:
+        tr.write_line(f"{p.total * 1000:8.1f}ms  {p.nodeid}")
+        tr.write_line(f"            {_fmt(p.categories)}")
+
+    path = config.getoption("--profile-collapsed")
+    if path:
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("\n".join(profiler.collapsed_stacks(results)) + "\n")
+        tr.write_line(f"collapsed stacks written to {path}")
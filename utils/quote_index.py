@@ -0,0 +1,337 @@
+"""Local quote corpus snapshot with an inverted index.
+
+Usage:
+    python -m utils.quote_index sync --max-pages 200
+    python -m utils.quote_index sync --full
+    python -m utils.quote_index query funny --type tag
+"""
+import argparse
+import gzip
+import json
+import logging
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Optional
+
+from api.quotes_api import QuotesAPI
+from utils.logger import get_logger
+
+SNAPSHOT_FILE = Path(__file__).parent.parent / ".quote_snapshot.json.gz"
+SNAPSHOT_VERSION = 1
+WORD = re.compile(r"[a-z0-9']+")
+FIELDS = ("tag", "author", "word")
+
+
+def tokenize(text: str) -> list:
+    return WORD.findall(text.lower())
+
+
+def _encode(ids) -> list:
+    """Sorted ids as deltas, which keeps the snapshot small."""
+    out, prev = [], 0
+    for i in sorted(ids):
+        out.append(i - prev)
+        prev = i
+    return out
+
+
+def _decode(deltas) -> frozenset:
+    ids, acc = [], 0
+    for d in deltas:
+        acc += d
+        ids.append(acc)
+    return frozenset(ids)
+
+
+@dataclass
+class FilterDiff:
+    """Server filter result compared with the local index."""
+    query: str
+    filter_type: Optional[str]
+    missing: frozenset      # in the local index, not returned by the server
+    unexpected: frozenset   # returned by the server, not in the local index
+    truncated: bool = False  # server results were cut by max_pages, missing is not checked
+
+    @property
+    def ok(self) -> bool:
+        return not self.missing and not self.unexpected
+
+
+class QuoteCorpus:
+    """Quotes (id -> (author, body, tags)) plus tag/author/word postings."""
+
+    def __init__(self):
+        self.quotes = {}
+        self.index = {f: {} for f in FIELDS}
+        self.complete = False   # whole listing downloaded at least once
+        self.page_size = 0
+        self.refreshed = 0      # known quotes re-indexed by the last sync
+        self._thawed = []       # (field, key) of postings made mutable since the last freeze
+
+    def __len__(self):
+        return len(self.quotes)
+
+    @property
+    def max_id(self) -> int:
+        return max(self.quotes, default=0)
+
+    @property
+    def min_id(self) -> int:
+        """Lowest id covered; 0 once the whole listing was downloaded."""
+        return 0 if self.complete else min(self.quotes, default=0)
+
+    @staticmethod
+    def _entry(quote) -> tuple:
+        return quote.author, quote.body, [t.lower() for t in quote.tags]
+
+    @staticmethod
+    def _keys(author: str, body: str, tags: list) -> dict:
+        return {"tag": tags, "author": [author.lower()] if author else [],
+                "word": tokenize(body)}
+
+    def _postings(self, f: str, value: str) -> set:
+        """Mutable postings for value, thawed until the next freeze."""
+        postings = self.index[f]
+        ids = postings.get(value)
+        if ids is None:
+            ids = postings[value] = set()
+            self._thawed.append((f, value))
+        elif isinstance(ids, frozenset):
+            ids = postings[value] = set(ids)
+            self._thawed.append((f, value))
+        return ids
+
+    def add(self, quote) -> bool:
+        """Index a Quote; returns False if it was already known."""
+        if quote.id in self.quotes:
+            return False
+        entry = self.quotes[quote.id] = self._entry(quote)
+        for f, values in self._keys(*entry).items():
+            for value in values:
+                self._postings(f, value).add(quote.id)
+        return True
+
+    def remove(self, quote_id: int) -> bool:
+        """Drop a quote from the corpus; returns False if it was unknown."""
+        entry = self.quotes.pop(quote_id, None)
+        if entry is None:
+            return False
+        for f, values in self._keys(*entry).items():
+            for value in values:
+                ids = self._postings(f, value)
+                ids.discard(quote_id)
+                if not ids:
+                    del self.index[f][value]
+        return True
+
+    def refresh(self, quote) -> bool:
+        """Re-index a known quote whose author, body or tags changed."""
+        old = self.quotes.get(quote.id)
+        if old is None or old == self._entry(quote):
+            return False
+        self.remove(quote.id)
+        self.add(quote)
+        return True
+
+    def add_all(self, quotes: Iterable, freeze: bool = True) -> int:
+        added = sum(self.add(q) for q in quotes)
+        if freeze:
+            self._freeze()
+        return added
+
+    def _freeze(self):
+        """Frozen postings are returned by queries without copying.
+
+        Only postings changed since the last freeze are converted.
+        """
+        for f, key in self._thawed:
+            ids = self.index[f].get(key)
+            if ids is not None and not isinstance(ids, frozenset):
+                self.index[f][key] = frozenset(ids)
+        self._thawed = []
+
+    def sync(self, api: QuotesAPI, max_pages: Optional[int] = None) -> int:
+        """Fetch quotes added since the last sync, then continue the backfill.
+
+        The listing is newest first: the head is read until a page with
+        nothing new, the tail resumes where an interrupted sync stopped.
+        Known quotes seen on head pages are re-indexed when edited; edits
+        further down and deleted quotes are only picked up by resync().
+        Postings stay mutable while pages come in and are frozen once.
+        """
+        self.refreshed = 0
+        try:
+            return self._sync(api, max_pages)
+        finally:
+            self._freeze()
+
+    def resync(self, api: QuotesAPI) -> int:
+        """Download the whole listing again and replace the corpus.
+
+        Returns the number of quotes dropped or changed. The corpus is
+        only replaced once the listing was read to the end.
+        """
+        fresh = QuoteCorpus()
+        fresh.sync(api)
+        changed = sum(1 for i, entry in self.quotes.items() if fresh.quotes.get(i) != entry)
+        self.__dict__.update(fresh.__dict__)
+        return changed
+
+    def _sync(self, api: QuotesAPI, max_pages: Optional[int]) -> int:
+        added, fetched, page = 0, 0, 1
+
+        def budget_left():
+            return max_pages is None or fetched < max_pages
+
+        while budget_left():
+            quotes, last = api.get_page(page)
+            fetched += 1
+            new = self.add_all(quotes, freeze=False)
+            self.refreshed += sum(self.refresh(q) for q in quotes)
+            added += new
+            if page == 1 and not last:
+                self.page_size = len(quotes)
+            if last:
+                self.complete = True
+                return added
+            if not new:
+                break
+            page += 1
+
+        if not self.complete and self.page_size:
+            page = max(page + 1, len(self.quotes) // self.page_size + 1)
+            while budget_left():
+                quotes, last = api.get_page(page)
+                fetched += 1
+                added += self.add_all(quotes, freeze=False)
+                if last:
+                    self.complete = True
+                    break
+                page += 1
+        return added
+
+    # queries
+
+    def by_tag(self, tag: str) -> frozenset:
+        return frozenset(self.index["tag"].get(tag.lower(), ()))
+
+    def by_author(self, author: str) -> frozenset:
+        return frozenset(self.index["author"].get(author.lower(), ()))
+
+    def by_keyword(self, text: str) -> frozenset:
+        """Quotes whose body has all words of text."""
+        words = tokenize(text)
+        if not words:
+            return frozenset()
+        postings = self.index["word"]
+        sets = sorted((postings.get(w, frozenset()) for w in words), key=len)
+        result = set(sets[0])
+        for s in sets[1:]:
+            result &= s
+        return frozenset(result)
+
+    def query(self, query: str, filter_type: Optional[str] = None) -> frozenset:
+        """Ids matching a FavQs filter/type pair."""
+        if filter_type == "tag":
+            return self.by_tag(query)
+        if filter_type == "author":
+            return self.by_author(query)
+        if filter_type is None:
+            return self.by_keyword(query)
+        raise ValueError(f"Unsupported filter type '{filter_type}'")
+
+    def compare(self, server_ids: Iterable[int], query: str,
+                filter_type: Optional[str] = None, truncated: bool = False) -> FilterDiff:
+        """Diff server results against the snapshot.
+
+        Server ids outside the snapshot range are ignored, sync first to
+        cover them. With truncated server results only unexpected ids
+        are reported.
+        """
+        low, top = self.min_id, self.max_id
+        server = frozenset(i for i in server_ids if low <= i <= top)
+        local = self.query(query, filter_type)
+        missing = frozenset() if truncated else local - server
+        return FilterDiff(query, filter_type, missing=missing, unexpected=server - local,
+                          truncated=truncated)
+
+    def verify(self, api: QuotesAPI, query: str, filter_type: Optional[str] = None,
+               max_pages: Optional[int] = None) -> FilterDiff:
+        server_ids, page, truncated = [], 1, False
+        while True:
+            if max_pages is not None and page > max_pages:
+                truncated = True
+                break
+            quotes, last = api.get_page(page, query, filter_type)
+            server_ids.extend(q.id for q in quotes)
+            if last:
+                break
+            page += 1
+        return self.compare(server_ids, query, filter_type, truncated)
+
+    # snapshot file
+
+    def save(self, path=SNAPSHOT_FILE):
+        data = {
+            "version": SNAPSHOT_VERSION,
+            "complete": self.complete,
+            "page_size": self.page_size,
+            "quotes": [[i, *self.quotes[i]] for i in sorted(self.quotes)],
+            "index": {f: {k: _encode(v) for k, v in postings.items()}
+                      for f, postings in self.index.items()},
+        }
+        with gzip.open(path, "wt", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+
+    @classmethod
+    def load(cls, path=SNAPSHOT_FILE) -> "QuoteCorpus":
+        corpus = cls()
+        path = Path(path)
+        if not path.exists():
+            return corpus
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version") != SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported snapshot version {data.get('version')} in {path}")
+        corpus.complete = data.get("complete", False)
+        corpus.page_size = data.get("page_size", 0)
+        corpus.quotes = {q[0]: (q[1], q[2], q[3]) for q in data["quotes"]}
+        corpus.index = {f: {k: _decode(v) for k, v in data["index"].get(f, {}).items()}
+                        for f in FIELDS}
+        return corpus
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m utils.quote_index")
+    parser.add_argument("--snapshot", default=str(SNAPSHOT_FILE))
+    parser.add_argument("-v", "--verbose", action="store_true", help="log every request")
+    sub = parser.add_subparsers(dest="command", required=True)
+    s = sub.add_parser("sync", help="download new quotes into the snapshot")
+    s.add_argument("--max-pages", type=int, default=None)
+    s.add_argument("--full", action="store_true",
+                   help="download the whole listing again, drops deleted and edited quotes")
+    q = sub.add_parser("query", help="answer a filter from the snapshot")
+    q.add_argument("text")
+    q.add_argument("--type", dest="filter_type", choices=["tag", "author"], default=None)
+    args = parser.parse_args(argv)
+
+    if not args.verbose:
+        get_logger(QuotesAPI.__name__).setLevel(logging.WARNING)
+
+    corpus = QuoteCorpus.load(args.snapshot)
+    if args.command == "sync" and args.full:
+        changed = corpus.resync(QuotesAPI())
+        corpus.save(args.snapshot)
+        print(f"Resynced, {changed} quotes dropped or changed, {len(corpus)} in snapshot")
+    elif args.command == "sync":
+        added = corpus.sync(QuotesAPI(), args.max_pages)
+        corpus.save(args.snapshot)
+        print(f"Added {added} quotes, refreshed {corpus.refreshed}, {len(corpus)} in snapshot")
+    else:
+        ids = sorted(corpus.query(args.text, args.filter_type))
+        print(f"{len(ids)} quotes: {ids[:50]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Per-test flight recorder for request/response logs."""
+import json
+import time
+from collections import deque
+
+from config import RECORDER_CAPACITY, RECORDER_MAX_BODY
+
+
+class FlightRecorder:
+    """Bounded ring buffer of redacted request/response entries.
+
+    Only the first max_body chars of a body are kept, so memory and
+    recording cost stay bounded whatever the payload size. Bodies are
+    pretty-printed in dump(), which runs on failure only.
+    """
+
+    def __init__(self, capacity=RECORDER_CAPACITY, max_body=RECORDER_MAX_BODY):
+        self.entries = deque(maxlen=capacity)
+        self.max_body = max_body
+        self.dropped = 0
+
+    def record(self, kind, line, headers=None, body=None, size=None):
+        """Record an entry; size is the full body length when body is already a slice."""
+        if len(self.entries) == self.entries.maxlen:
+            self.dropped += 1
+        if body is not None:
+            if not isinstance(body, str):
+                body = json.dumps(body, ensure_ascii=False, default=str)
+            size = max(size or 0, len(body))
+            body = body[:self.max_body]
+        self.entries.append((time.time(), kind, line, headers, body, size))
+
+    def clear(self):
+        self.entries.clear()
+        self.dropped = 0
+
+    @staticmethod
+    def _fmt_body(body, size):
+        if size > len(body):
+            return f"{body}... [truncated, {size} in total]"
+        try:
+            return json.dumps(json.loads(body), indent=2, ensure_ascii=False)
+        except ValueError:
+            return body
+
+    def dump(self) -> str:
+        lines = []
+        if self.dropped:
+            lines.append(f"... {self.dropped} earlier entries dropped")
+        for ts, kind, line, headers, body, size in self.entries:
+            stamp = time.strftime("%H:%M:%S", time.localtime(ts)) + f".{int(ts % 1 * 1000):03d}"
+            lines.append(f"{stamp} {kind} {line}")
+            if headers:
+                lines.append(f"  Headers: {headers}")
+            if body is not None:
+                lines.append("  Body: " + self._fmt_body(body, size).replace("\n", "\n  "))
+        return "\n".join(lines)
+
+
+_current = None
+
+
+def start_recording() -> FlightRecorder:
+    global _current
+    _current = FlightRecorder()
+    return _current
+
+
+def stop_recording():
+    global _current
+    _current = None
+
+
+def get_recorder():
+    """Recorder of the running test, or None outside tests."""
+    return _current
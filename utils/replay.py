@@ -0,0 +1,252 @@
+"""Trace-driven replay of recorded FavQs traffic through UserAPI.
+
+Trace is JSON lines, one request per line:
+
+    {"ts": 1718000000.25, "user": "alice", "method": "POST", "path": "/api/users"}
+    {"ts": 1718000001.10, "user": "alice", "method": "GET", "path": "/api/users/alice"}
+
+Usage:
+    python -m utils.replay trace.jsonl --speed 2 --workers 16
+"""
+import argparse
+import json
+import logging
+import queue
+import re
+import threading
+import time
+import zlib
+from dataclasses import dataclass, field
+from typing import Optional
+
+import requests
+
+from api.user_api import UserAPI
+from config import Target, get_target
+from models.user import UserData
+from utils.logger import get_logger
+from utils.stats import LatencyStats
+
+USER_PATH = re.compile(r"^/users/([^/?]+)")
+PROVISION = "provision"
+UPDATE_SKIP = ("login", "email", "password")
+
+
+@dataclass
+class TraceEvent:
+    ts: float
+    user: str
+    method: str
+    path: str
+    body: dict = field(default_factory=dict)
+
+    @property
+    def endpoint(self) -> str:
+        """Operation name the event replays as."""
+        if self.path == "/users":
+            return "create_user" if self.method == "POST" else "unsupported"
+        if self.path == "/session":
+            return {"POST": "create_session", "DELETE": "destroy_session"}.get(self.method, "unsupported")
+        if USER_PATH.match(self.path):
+            return {"GET": "get_user", "PUT": "update_user"}.get(self.method, "unsupported")
+        return "unsupported"
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "TraceEvent":
+        path = data["path"].split("?", 1)[0]
+        if path.startswith("/api/"):
+            path = path[4:]
+        return cls(
+            ts=float(data["ts"]),
+            user=str(data["user"]),
+            method=data["method"].upper(),
+            path=path.rstrip("/") or "/",
+            body=data.get("body") or {},
+        )
+
+
+def load_trace(path, limit: Optional[int] = None) -> list:
+    events = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            events.append(TraceEvent.from_dict(json.loads(line)))
+            if limit and len(events) >= limit:
+                break
+    events.sort(key=lambda e: e.ts)
+    return events
+
+
+class ReplayUser:
+    """Replay-side account and session of one trace user."""
+
+    def __init__(self, name: str, client: UserAPI):
+        self.name = name
+        self.data = UserData.generate(prefix="replay")
+        self.client = client
+        self.created = False
+
+    def ensure_created(self):
+        """Provision the account of a user whose trace starts mid-life."""
+        if self.created:
+            return None
+        resp = self.client.create_user(self.data)
+        self.created = True
+        return resp
+
+
+class Replayer:
+    """Replays events at their original offsets divided by speed.
+
+    Events of one user always go to the same worker, so they run in
+    trace order and reuse that user's session token. Unsupported events
+    are skipped and only counted.
+    """
+
+    def __init__(self, events, speed: float = 1.0, workers: int = 8, target: Optional[Target] = None,
+                 factory=UserAPI):
+        self.events = events
+        self.speed = speed
+        self.workers = workers
+        self.target = target
+        self.factory = factory
+        self.unsupported = 0
+        self.users = {}
+        self.logins = {}
+        self.latency = LatencyStats()
+        self.lag = LatencyStats()
+        self._queues = [queue.Queue() for _ in range(workers)]
+        self.started = self.finished = 0.0
+
+    def _user(self, name: str) -> ReplayUser:
+        user = self.users.get(name)
+        if user is None:
+            user = self.users[name] = ReplayUser(name, self.factory(target=self.target))
+            self.logins[name] = user.data.login
+        return user
+
+    def _login(self, original: str) -> str:
+        """Map a login seen in the trace to its replay account."""
+        return self.logins.get(original, original)
+
+    def _execute(self, event: TraceEvent, user: ReplayUser):
+        api = user.client
+        op = event.endpoint
+        if op == "create_user":
+            user.created = True
+            return api.create_user(user.data)
+        if op == "get_user":
+            login = self._login(USER_PATH.match(event.path).group(1))
+            return api.get_user(login, authenticated=api.user_token is not None)
+        if op == "update_user":
+            fields = {k: v for k, v in event.body.get("user", {}).items() if k not in UPDATE_SKIP}
+            return api.update_user(user.data.login, **fields)
+        if op == "create_session":
+            return api.create_session(user.data.login, user.data.password)
+        if op == "destroy_session":
+            resp = api.destroy_session()
+            if resp.status_code == 200 and resp.as_error() is None:
+                api.user_token = None
+            return resp
+        return None
+
+    def _worker(self, q: queue.Queue):
+        while True:
+            item = q.get()
+            if item is None:
+                return
+            due, event, user = item
+            # provisioning is timed as its own row, not inside the event's latency
+            if not user.created and event.endpoint != "create_user":
+                self._timed(PROVISION, user.ensure_created)
+            self.lag.add(event.endpoint, max(time.perf_counter() - due, 0.0))
+            self._timed(event.endpoint, lambda: self._execute(event, user))
+
+    def _timed(self, key: str, call):
+        start = time.perf_counter()
+        try:
+            resp = call()
+            error = resp is not None and (resp.status_code >= 400 or resp.as_error() is not None)
+        except requests.RequestException:
+            error = True
+        self.latency.add(key, time.perf_counter() - start, error)
+
+    def run(self):
+        threads = [threading.Thread(target=self._worker, args=(q,), daemon=True) for q in self._queues]
+        for t in threads:
+            t.start()
+
+        t0 = self.events[0].ts if self.events else 0.0
+        self.started = time.perf_counter()
+        for event in self.events:
+            if event.endpoint == "unsupported":
+                self.unsupported += 1
+                continue
+            due = self.started + (event.ts - t0) / self.speed
+            delay = due - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            # users are created here, in the dispatcher, so mapping stays single-threaded
+            user = self._user(event.user)
+            worker = zlib.crc32(event.user.encode()) % self.workers
+            self._queues[worker].put((due, event, user))
+
+        for q in self._queues:
+            q.put(None)
+        for t in threads:
+            t.join()
+        self.finished = time.perf_counter()
+        return self
+
+    @property
+    def replayed(self) -> int:
+        return len(self.events) - self.unsupported
+
+    @property
+    def intended_rate(self) -> float:
+        if len(self.events) < 2:
+            return 0.0
+        span = (self.events[-1].ts - self.events[0].ts) / self.speed
+        return self.replayed / span if span > 0 else 0.0
+
+    @property
+    def achieved_rate(self) -> float:
+        elapsed = self.finished - self.started
+        return self.replayed / elapsed if elapsed > 0 else 0.0
+
+    def report(self) -> str:
+        return "\n".join([
+            f"events: {len(self.events)}  replayed: {self.replayed}  unsupported (skipped): {self.unsupported}  "
+            f"users: {len(self.users)}  speed: {self.speed}x",
+            f"intended rate: {self.intended_rate:.1f} req/s  achieved rate: {self.achieved_rate:.1f} req/s  "
+            f"wall: {self.finished - self.started:.1f}s",
+            "",
+            self.latency.table("latency"),
+            "",
+            self.lag.table("start lag"),
+        ])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m utils.replay")
+    parser.add_argument("trace", help="JSON lines access log")
+    parser.add_argument("--speed", type=float, default=1.0, help="time scale, 2 replays twice as fast")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--limit", type=int, default=None, help="replay only the first N events")
+    parser.add_argument("--target", default=None, help="target name, see config.get_target")
+    parser.add_argument("-v", "--verbose", action="store_true", help="log every request")
+    args = parser.parse_args(argv)
+
+    if not args.verbose:
+        get_logger(UserAPI.__name__).setLevel(logging.WARNING)
+
+    events = load_trace(args.trace, args.limit)
+    target = get_target(args.target) if args.target else None
+    replayer = Replayer(events, speed=args.speed, workers=args.workers, target=target)
+    print(replayer.run().report())
+
+
+if __name__ == "__main__":
+    main()
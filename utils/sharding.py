@@ -0,0 +1,130 @@
+"""Deterministic test sharding and shard result merging.
+
+Usage:
+    pytest --shard 2/4
+    python -m utils.sharding merge shards/* --out allure-results
+"""
+import argparse
+import heapq
+import json
+import os
+import shutil
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).parent.parent
+SHARDS_DIR = ROOT_DIR / "shards"
+DURATIONS_FILE = ROOT_DIR / ".test_durations.json"
+DEFAULT_DURATION = 1.0
+MAX_SHARDS = 99
+
+
+def parse_shard(value: str):
+    """Parse 'i/N' into 1-based (index, total)."""
+    try:
+        index, total = (int(x) for x in value.split("/"))
+    except ValueError:
+        raise ValueError(f"Bad shard '{value}', expected i/N") from None
+    if not 1 <= index <= total:
+        raise ValueError(f"Bad shard '{value}', index must be in 1..{total}")
+    if total > MAX_SHARDS:
+        raise ValueError(f"Bad shard '{value}', at most {MAX_SHARDS} shards")
+    return index, total
+
+
+def shard_namespace(index: int) -> str:
+    """Prefix for generated test data of a shard.
+
+    Fixed width, so no shard can generate another shard's ids; two digits
+    keep "testuser_" + namespace + 8 hex chars within the 20 char login limit.
+    """
+    return f"s{index:02d}"
+
+
+def bundle_dir(index: int, total: int) -> Path:
+    return SHARDS_DIR / f"shard-{index}-of-{total}"
+
+
+def load_durations(path) -> dict:
+    path = Path(path)
+    if not path.exists():
+        return {}
+    with path.open(encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_durations(path, durations: dict):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8") as f:
+        json.dump(durations, f, indent=0, sort_keys=True)
+
+
+def assign_shards(nodeids, total: int, durations: dict) -> dict:
+    """Map nodeid -> 1-based shard, balanced by known durations.
+
+    Longest tests go first to the least loaded shard; ties break on
+    nodeid and shard index so every shard computes the same split.
+    """
+    known = [durations[n] for n in nodeids if n in durations]
+    default = sum(known) / len(known) if known else DEFAULT_DURATION
+
+    weighted = sorted(((durations.get(n, default), n) for n in nodeids),
+                      key=lambda x: (-x[0], x[1]))
+    loads = [(0.0, i) for i in range(1, total + 1)]
+    assignment = {}
+    for duration, nodeid in weighted:
+        load, index = heapq.heappop(loads)
+        assignment[nodeid] = index
+        heapq.heappush(loads, (load + duration, index))
+    return assignment
+
+
+def _link_or_copy(src: str, dst: str):
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copyfile(src, dst)
+
+
+def merge(bundles, out_dir, durations_out=DURATIONS_FILE) -> int:
+    """Merge shard bundles into one allure dir and one durations file.
+
+    Allure result files have unique names, so files are hard-linked
+    (or copied across filesystems) without being parsed.
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    existing = {e.name for e in os.scandir(out_dir)}
+    durations = load_durations(durations_out)
+    merged = 0
+
+    for bundle in map(Path, bundles):
+        results = bundle / "allure-results"
+        if results.is_dir():
+            for entry in os.scandir(results):
+                if not entry.is_file() or entry.name in existing:
+                    continue
+                _link_or_copy(entry.path, str(out_dir / entry.name))
+                existing.add(entry.name)
+                merged += 1
+        durations.update(load_durations(bundle / "durations.json"))
+
+    save_durations(durations_out, durations)
+    return merged
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m utils.sharding")
+    sub = parser.add_subparsers(dest="command", required=True)
+    m = sub.add_parser("merge", help="merge shard bundles")
+    m.add_argument("bundles", nargs="+", help="shard bundle dirs")
+    m.add_argument("--out", default=str(ROOT_DIR / "allure-results"), help="merged allure dir")
+    m.add_argument("--durations", default=str(DURATIONS_FILE), help="merged durations file")
+    args = parser.parse_args(argv)
+
+    count = merge(args.bundles, args.out, args.durations)
+    print(f"Merged {count} result files from {len(args.bundles)} shards into {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,277 @@
+"""Soak runner: loops UserAPI flows and watches for client-side leaks.
+
+Usage:
+    python -m utils.soak --flow profile_read --duration 3600 --interval 60
+    python -m utils.soak --flow session_churn --iterations 20000
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+import requests
+
+from api.circuit_breaker import CircuitOpenError
+from api.user_api import UserAPI
+from models.user import UserData
+from utils.logger import get_logger
+
+
+# flows: take a long-lived client, do one-time setup, return the step to loop;
+# a step returns the responses it got
+
+def failed(resp) -> bool:
+    return resp.status_code >= 400 or resp.as_error() is not None
+
+
+def _setup(resp, what: str):
+    """Setup must succeed, or every step would measure error responses."""
+    if failed(resp):
+        raise RuntimeError(f"Soak setup failed, {what}: {resp.status_code} {resp.text[:200]}")
+
+
+def profile_read(api: UserAPI) -> Callable:
+    user = UserData.generate(prefix="soak")
+    _setup(api.create_user(user), "create_user")
+    return lambda: (api.get_user(user.login, authenticated=True),)
+
+
+def session_churn(api: UserAPI) -> Callable:
+    user = UserData.generate(prefix="soak")
+    _setup(api.create_user(user), "create_user")
+
+    def step():
+        return api.destroy_session(), api.create_session(user.login, user.password)
+    return step
+
+
+def register(api: UserAPI) -> Callable:
+    def step():
+        responses = [api.destroy_session()] if api.user_token else []
+        user = UserData.generate(prefix="soak")
+        responses.append(api.create_user(user))
+        responses.append(api.get_user(user.login, authenticated=True))
+        return responses
+    return step
+
+
+FLOWS = {f.__name__: f for f in (profile_read, session_churn, register)}
+
+
+def open_fds() -> Optional[int]:
+    """Open file descriptors of the process; None where /proc is missing."""
+    try:
+        return len(os.listdir("/proc/self/fd"))
+    except OSError:
+        return None
+
+
+def rss_bytes() -> Optional[int]:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return None
+
+
+def pooled_connections(api: UserAPI) -> int:
+    """Connections created by the session's urllib3 pools."""
+    total = 0
+    for adapter in api.session.adapters.values():
+        manager = getattr(adapter, "poolmanager", None)
+        if manager is None:
+            continue
+        for key in list(manager.pools.keys()):
+            pool = manager.pools.get(key)
+            if pool is not None:
+                total += pool.num_connections
+    return total
+
+
+@dataclass
+class Sample:
+    iteration: int
+    elapsed: float
+    heap: int
+    rss: Optional[int]
+    fds: Optional[int]
+    connections: int
+
+
+@dataclass
+class Thresholds:
+    heap_growth: int = 5 * 1024 * 1024
+    fd_growth: int = 10
+    connection_growth: int = 10
+
+
+@dataclass
+class SoakReport:
+    flow: str
+    samples: list = field(default_factory=list)
+    top_sites: list = field(default_factory=list)
+    failures: list = field(default_factory=list)
+    errors: int = 0
+
+    @property
+    def ok(self) -> bool:
+        return not self.failures
+
+    def render(self) -> str:
+        lines = [f"soak '{self.flow}': {'OK' if self.ok else 'FAILED'}, request errors: {self.errors}",
+                 f"{'iter':>8} {'elapsed s':>10} {'heap KiB':>10} {'rss KiB':>10} {'fds':>6} {'conns':>6}"]
+        for s in self.samples:
+            rss = s.rss // 1024 if s.rss is not None else "-"
+            fds = s.fds if s.fds is not None else "-"
+            lines.append(f"{s.iteration:>8} {s.elapsed:>10.1f} {s.heap // 1024:>10} {rss:>10} {fds:>6} "
+                         f"{s.connections:>6}")
+        lines.extend(f"FAIL: {f}" for f in self.failures)
+        if self.top_sites:
+            lines.append("top allocation growth since baseline:")
+            lines.extend(f"  {site}" for site in self.top_sites)
+        return "\n".join(lines)
+
+
+class SoakRunner:
+    """Loops a flow on one client, sampling memory, fds and pool connections.
+
+    The baseline is taken after warmup iterations, so caches and pools
+    that fill once are not reported as leaks.
+    """
+
+    def __init__(self, flow: str, duration: Optional[float] = None, iterations: Optional[int] = None,
+                 interval: float = 30.0, warmup: int = 20, thresholds: Thresholds = None,
+                 frames: int = 5, top: int = 10, client: Optional[UserAPI] = None):
+        if flow not in FLOWS:
+            raise ValueError(f"Unknown flow '{flow}', expected one of {sorted(FLOWS)}")
+        if duration is None and iterations is None:
+            raise ValueError("Set duration or iterations")
+        self.flow = flow
+        self.duration = duration
+        self.iterations = iterations
+        self.interval = interval
+        self.warmup = warmup
+        self.thresholds = thresholds or Thresholds()
+        self.frames = frames
+        self.top = top
+        self.api = client or UserAPI()
+
+    def _sample(self, iteration, started) -> Sample:
+        heap, _ = tracemalloc.get_traced_memory()
+        return Sample(iteration, time.monotonic() - started, heap, rss_bytes(), open_fds(),
+                      pooled_connections(self.api))
+
+    def _done(self, iteration, started) -> bool:
+        if self.iterations is not None and iteration >= self.iterations:
+            return True
+        return self.duration is not None and time.monotonic() - started >= self.duration
+
+    def _step(self, step, report):
+        """Counts an iteration with a failed request as one error.
+
+        CircuitOpenError is not caught: the run is aborted once the
+        target looks broken instead of looping on short-circuits.
+        """
+        try:
+            responses = step()
+        except CircuitOpenError:
+            raise
+        except requests.RequestException:
+            report.errors += 1
+            return
+        if any(failed(r) for r in responses):
+            report.errors += 1
+
+    def run(self) -> SoakReport:
+        report = SoakReport(self.flow)
+        try:
+            self._run(report)
+        except CircuitOpenError as e:
+            report.failures.append(f"aborted: {e}")
+        return report
+
+    def _run(self, report: SoakReport):
+        step = FLOWS[self.flow](self.api)
+        for _ in range(self.warmup):
+            self._step(step, report)
+
+        was_tracing = tracemalloc.is_tracing()
+        if not was_tracing:
+            tracemalloc.start(self.frames)
+        try:
+            baseline = tracemalloc.take_snapshot()
+            started = time.monotonic()
+            report.samples.append(self._sample(0, started))
+            next_sample = started + self.interval
+
+            iteration = 0
+            while not self._done(iteration, started):
+                self._step(step, report)
+                iteration += 1
+                if time.monotonic() >= next_sample:
+                    report.samples.append(self._sample(iteration, started))
+                    next_sample += self.interval
+            report.samples.append(self._sample(iteration, started))
+
+            # leave out the runner's own samples and tracemalloc bookkeeping
+            filters = [tracemalloc.Filter(False, __file__), tracemalloc.Filter(False, tracemalloc.__file__)]
+            stats = (tracemalloc.take_snapshot().filter_traces(filters)
+                     .compare_to(baseline.filter_traces(filters), "traceback"))
+            growth = sum(s.size_diff for s in stats)
+            report.top_sites = [_fmt_stat(s) for s in stats[:self.top] if s.size_diff > 0]
+        finally:
+            if not was_tracing:
+                tracemalloc.stop()
+
+        self._check(report, growth)
+
+    def _check(self, report: SoakReport, heap_growth: int):
+        first, last = report.samples[0], report.samples[-1]
+        t = self.thresholds
+        if heap_growth > t.heap_growth:
+            report.failures.append(f"traced heap grew by {heap_growth // 1024} KiB "
+                                   f"(limit {t.heap_growth // 1024} KiB)")
+        if first.fds is not None and last.fds - first.fds > t.fd_growth:
+            report.failures.append(f"open fds grew {first.fds} -> {last.fds} (limit +{t.fd_growth})")
+        if last.connections - first.connections > t.connection_growth:
+            report.failures.append(f"pooled connections created {first.connections} -> {last.connections} "
+                                   f"(limit +{t.connection_growth})")
+
+
+def _fmt_stat(stat) -> str:
+    frames = list(stat.traceback)  # oldest first
+    where = f"{frames[-1].filename}:{frames[-1].lineno}"
+    callers = " <- ".join(f"{os.path.basename(f.filename)}:{f.lineno}" for f in reversed(frames[-3:-1]))
+    text = f"+{stat.size_diff / 1024:.1f} KiB ({stat.count_diff:+d} blocks) {where}"
+    return f"{text}  [{callers}]" if callers else text
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m utils.soak")
+    parser.add_argument("--flow", choices=sorted(FLOWS), default="profile_read")
+    parser.add_argument("--duration", type=float, default=None, help="seconds to run")
+    parser.add_argument("--iterations", type=int, default=None)
+    parser.add_argument("--interval", type=float, default=30.0, help="seconds between samples")
+    parser.add_argument("--warmup", type=int, default=20, help="iterations before the baseline")
+    parser.add_argument("--max-heap-growth-kb", type=int, default=5 * 1024)
+    parser.add_argument("--max-fd-growth", type=int, default=10)
+    parser.add_argument("--max-connection-growth", type=int, default=10)
+    parser.add_argument("--frames", type=int, default=5, help="traceback depth of allocation sites")
+    args = parser.parse_args(argv)
+    if args.duration is None and args.iterations is None:
+        parser.error("set --duration or --iterations")
+
+    get_logger(UserAPI.__name__).setLevel(logging.WARNING)
+    thresholds = Thresholds(args.max_heap_growth_kb * 1024, args.max_fd_growth, args.max_connection_growth)
+    report = SoakRunner(args.flow, args.duration, args.iterations, args.interval, args.warmup,
+                        thresholds, args.frames).run()
+    print(report.render())
+    sys.exit(0 if report.ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Latency statistics."""
+import math
+import threading
+from collections import defaultdict
+
+
+def percentile(sorted_values, q: float) -> float:
+    """Nearest-rank percentile of an already sorted list, q in 0..100."""
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(q / 100 * len(sorted_values)) - 1, 0)
+    return sorted_values[rank]
+
+
+class LatencyStats:
+    """Thread-safe latency samples grouped by key (endpoint, target...)."""
+
+    def __init__(self):
+        self._samples = defaultdict(list)
+        self._errors = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def add(self, key, seconds: float, error: bool = False):
+        with self._lock:
+            self._samples[key].append(seconds)
+            if error:
+                self._errors[key] += 1
+
+    def keys(self):
+        return sorted(self._samples, key=str)
+
+    def summary(self, key) -> dict:
+        with self._lock:
+            values = sorted(self._samples.get(key, ()))
+            errors = self._errors.get(key, 0)
+        return {
+            "count": len(values),
+            "errors": errors,
+            "mean": sum(values) / len(values) if values else 0.0,
+            "p50": percentile(values, 50),
+            "p95": percentile(values, 95),
+            "p99": percentile(values, 99),
+            "max": values[-1] if values else 0.0,
+        }
+
+    def table(self, title: str = "endpoint") -> str:
+        lines = [f"{title:<28} {'count':>7} {'errors':>7} {'p50 ms':>9} {'p95 ms':>9} "
+                 f"{'p99 ms':>9} {'max ms':>9}"]
+        for key in self.keys():
+            s = self.summary(key)
+            lines.append(f"{str(key):<28} {s['count']:>7} {s['errors']:>7} {s['p50'] * 1000:>9.1f} "
+                         f"{s['p95'] * 1000:>9.1f} {s['p99'] * 1000:>9.1f} {s['max'] * 1000:>9.1f}")
+        return "\n".join(lines)